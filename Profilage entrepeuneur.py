@@ -1,36 +1,68 @@
 import streamlit as st
-import streamlit.components.v1 as components
-from openai import OpenAI
-import json
 from datetime import datetime
-import io
-from docx import Document
-from docx.shared import Inches
-import plotly.graph_objects as go
-import plotly.express as px
-import plotly.io as pio
-import pandas as pd
 import os
+import json
+import logging
+import queue
+import secrets
+import sys
+import threading
 import urllib.parse
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from llm_cache import LLMResponseCache, make_cache_key
+from stream_render import StreamRenderer
+from chat_history import ChatHistoryManager, count_message_tokens
+from scoring import COMPETENCES, QUESTION_INDEX, TOTAL_QUESTIONS, ScoreAggregate, calculer_profil, make_scores_csv, question_key
+from export_cache import ExportCache, content_key
+from figures import build_heatmap, build_radar
+from session_store import SessionStore, make_backend
+from singleflight import SingleFlight
+from llm_usage import record_missing_usage, record_usage
+from prompt_templates import RECO_PERSONA, REGISTRY, PromptProfile
+from stream_cancel import close_upstream, record_cancelled, record_completed
+from llm_scheduler import PRIORITY_CHAT, PRIORITY_RECO, PRIORITY_REPORT, LLMScheduler, QueuePosition
+from documents import DOCX_MIME, make_docx, make_rapport_docx
+from radar_png import render_radar_png
+from resource_catalog import CatalogStore
+from resource_retrieval import format_resources, retrieve_resources
+import metrics
+
+# Cache des exports partagé par toutes les sessions
+@st.cache_resource
+def init_export_cache():
+    return ExportCache()
+
+# Bouton de téléchargement alimenté par le cache des exports.
+# Avec lazy=True, le fichier n'est construit qu'à la demande de l'utilisateur.
+def export_download_button(label: str, data_key: str, build, file_name: str, mime: str, key: str, lazy: bool = False):
+    cache = init_export_cache()
+    slot = st.empty()
+    if lazy and cache.get(data_key) is None:
+        if not slot.button(f"⚙️ {label}", key=f"{key}_prepare"):
+            return
+    slot.download_button(
+        label=label,
+        data=cache.get_or_build(data_key, build),
+        file_name=file_name,
+        mime=mime,
+        key=key,
+        on_click="ignore"
+    )
 
-# Fonction pour créer un document Word
-def make_docx(title: str, content: str) -> bytes:
-    buf = io.BytesIO()
-    doc = Document()
-    doc.add_heading(title, level=1)
-    doc.add_paragraph(datetime.now().strftime("%Y-%m-%d %H:%M"))
-    for line in content.splitlines():
-        doc.add_paragraph(line)
-    doc.save(buf)
-    buf.seek(0)
-    return buf.getvalue()
-
-# Fonction pour exporter les scores en CSV
-def make_scores_csv(scores: dict) -> str:
-    lines = ["competence,score"]
-    for comp, score in scores.items():
-        lines.append(f"{comp},{score:.2f}")
-    return "\n".join(lines)
+# Boutons de téléchargement TXT et Word d'un texte généré
+def afficher_telechargements(texte: str, nom_fichier: str, titre_doc: str, key_prefix: str, lazy: bool = False):
+    date = datetime.now().strftime('%Y%m%d')
+    col_txt, col_word = st.columns(2)
+    with col_txt:
+        export_download_button(
+            tr('download_txt'), content_key("txt", texte), lambda: texte,
+            f"{nom_fichier}_{date}.txt", "text/plain", f"{key_prefix}_txt"
+        )
+    with col_word:
+        export_download_button(
+            tr('download_word'), content_key("docx", titre_doc, texte), lambda: make_docx(titre_doc, texte),
+            f"{nom_fichier}_{date}.docx", DOCX_MIME, f"{key_prefix}_word", lazy=lazy
+        )
 
 # Directive de langue pour les réponses (Français / Wolof)
 def get_lang_directive() -> str:
@@ -92,6 +124,13 @@ TRANSLATIONS = {
         'plan_action_90_title': "🗓️ Plan d'action 90 jours",
         'plan_action_90_generate': "🗓️ Générer le plan 90 jours",
         'analyse_complete_button': "🚀 Analyse Complète et Recommandations Globales",
+        'generate_all_button': "⚡ Générer toutes les recommandations en une fois",
+        'resume_title': "💾 Reprendre plus tard",
+        'resume_code': "Votre code de reprise : `{code}`",
+        'resume_input': "Reprendre avec un code",
+        'resume_button': "Reprendre",
+        'resume_not_found': "Code introuvable ou expiré.",
+        'queue_position': "⏳ En file d'attente : position {position}",
         'download_analysis_complete': "💾 Télécharger l'analyse complète",
         'download_analysis_word': "Télécharger en Word (.docx)",
         'no_resource_match': "Aucune ressource correspondante. Essayez un autre mot-clé.",
@@ -172,6 +211,13 @@ TRANSLATIONS = {
         'plan_action_90_title': "🗓️ Palaan 90 fan",
         'plan_action_90_generate': "🗓️ Sos palaan 90 fan",
         'analyse_complete_button': "🚀 Analys bu mat ak Ndigël yu bari",
+        'generate_all_button': "⚡ Sos ndigël yépp benn yoon",
+        'resume_title': "💾 Dellu ci kanam",
+        'resume_code': "Sa kood bu dellu : `{code}`",
+        'resume_input': "Dellu ak kood",
+        'resume_button': "Dellu",
+        'resume_not_found': "Kood bi amul walla jeex na.",
+        'queue_position': "⏳ Ci rang bi : {position}",
         'download_analysis_complete': "💾 Yebal analays bi",
         'download_analysis_word': "Yebal ci Word (.docx)",
         'no_resource_match': "Amul resurs bu japp. Jéem benn baat bu wuute.",
@@ -292,60 +338,29 @@ def tr_comp(comp_name: str) -> str:
     lang = st.session_state.get('app_lang', 'Français')
     return COMP_LABELS.get(lang, COMP_LABELS['Français']).get(comp_name, comp_name)
 
-def tr(key: str) -> str:
+def tr(key: str, lang: str | None = None) -> str:
     """Retourne la traduction selon la langue choisie, avec fallback FR."""
-    lang = st.session_state.get('app_lang', 'Français')
+    lang = lang or st.session_state.get('app_lang', 'Français')
     return TRANSLATIONS.get(lang, TRANSLATIONS['Français']).get(key, TRANSLATIONS['Français'].get(key, key))
 
 # Définir la langue par défaut sur Français si non choisie
 if 'app_lang' not in st.session_state:
     st.session_state['app_lang'] = 'Français'
 
-# Mini référentiel de ressources locales (Sénégal)
-LOCAL_RESOURCES = [
-    {
-        "name": "DER/FJ",
-        "tags": ["financement", "accompagnement", "incubation", "jeunes", "femmes"],
-        "description": "Délégation générale à l’Entrepreneuriat Rapide des Femmes et des Jeunes — financement, incubation, appui aux jeunes et femmes.",
-        "link": "https://der.sn"
-    },
-    {
-        "name": "APIX",
-        "tags": ["investissement", "formalisation", "guichet unique"],
-        "description": "Promotion des investissements et guichet unique pour création d’entreprise.",
-        "link": "https://apix.sn"
-    },
-    {
-        "name": "ADEPME",
-        "tags": ["PME", "accompagnement", "diagnostics"],
-        "description": "Agence de Développement pour les PME — accompagnement et diagnostics (ne propose plus de formation).",
-        "link": "https://adepme.sn"
-    },
-    {
-        "name": "ANPEJ",
-        "tags": ["emploi", "jeunes", "formation", "stages"],
-        "description": "Agence Nationale pour l'Emploi des Jeunes — formations, stages, dispositifs d’insertion.",
-        "link": "https://anpej.sn"
-    },
-    {
-        "name": "ONFP — Office National de Formation Professionnelle",
-        "tags": ["formation", "certification", "apprentissage", "professionnelle"],
-        "description": "Programmes de formation professionnelle, certifications, apprentissage technique et reconversion.",
-        "link": "https://onfp.sn"
-    },
-    {
-        "name": "CBAO / Attijariwafa — Daaray Jàmbaar Yi",
-        "tags": ["mentorat", "formation", "financement", "réseau"],
-        "description": "Centre d’accompagnement avec mentorat pro, formations et facilitation d’accès au financement.",
-        "link": "https://cbao.sn"
-    },
-    {
-        "name": "Bourse Nationale de l’Emploi",
-        "tags": ["emploi", "plateforme", "jeunes"],
-        "description": "Plateforme d’offres d’emploi et d’opportunités pour les jeunes.",
-        "link": "https://bne.sn"
-    },
-]
+# Référentiel des ressources locales (Sénégal) : fichier JSON ou CSV, rechargé à chaud
+DEFAULT_RESOURCES_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ressources_locales.json")
+
+# Catalogue et index de recherche des ressources, partagés par toutes les sessions.
+# Un fichier configuré invalide au démarrage est remplacé par le catalogue fourni.
+@st.cache_resource
+def init_resource_catalog(path: str, poll_seconds: float):
+    return CatalogStore(path, poll_interval=poll_seconds, fallback=DEFAULT_RESOURCES_CATALOG)
+
+def get_resource_catalog():
+    return init_resource_catalog(
+        str(get_setting("resources_catalog_path", DEFAULT_RESOURCES_CATALOG)),
+        float(get_setting("resources_reload_seconds", 5)),
+    )
 
 # Configuration de la page
 st.set_page_config(
@@ -428,30 +443,204 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Modèle utilisé pour toutes les générations
+LLM_MODEL = "deepseek-chat"
+
+# Lecture d'un paramètre depuis secrets.toml ou variable d'environnement
+def get_setting(key: str, default=None):
+    try:
+        value = st.secrets.get(key)
+    except Exception:
+        value = None
+    if value is None:
+        value = os.environ.get(key.upper())
+    return default if value is None else value
+
+def setting_enabled(key: str, default: bool = False) -> bool:
+    value = get_setting(key, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "oui", "yes", "on")
+    return bool(value)
+
+# Journal de l'application (loggers « djambar.* ») sur la sortie d'erreur,
+# niveau réglé par log_level (INFO par défaut) ; configuré une fois par processus
+@st.cache_resource
+def init_logging(level: str) -> logging.Logger:
+    logger = logging.getLogger("djambar")
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+    numeric = logging.getLevelName(level.strip().upper())
+    logger.setLevel(numeric if isinstance(numeric, int) else logging.INFO)
+    return logger
+
+init_logging(str(get_setting("log_level", "INFO")))
+
+# Pool de connexions HTTP partagé par tous les clients (limites et délais configurables)
+@st.cache_resource
+def init_http_client():
+    from llm_transport import PooledHttpClient  # import différé (httpx)
+    return PooledHttpClient(
+        max_connections=int(get_setting("llm_max_connections", 20)),
+        max_keepalive=int(get_setting("llm_max_keepalive_connections", 10)),
+        keepalive_expiry=float(get_setting("llm_keepalive_expiry", 30)),
+        connect_timeout=float(get_setting("llm_connect_timeout", 5)),
+        read_timeout=float(get_setting("llm_read_timeout", 60)),
+        write_timeout=float(get_setting("llm_write_timeout", 10)),
+        pool_timeout=float(get_setting("llm_pool_timeout", 10)),
+    )
+
 # Initialisation du client d'analyse
 @st.cache_resource
 def init_analysis_client(api_key: str | None):
     if not api_key:
         return None
+    from openai import OpenAI  # import différé : le SDK est long à charger
+    # Nouvelles tentatives avec attente exponentielle sur 429/5xx gérées par le client
     return OpenAI(
         api_key=api_key,
-        base_url="https://api.deepseek.com"
+        base_url="https://api.deepseek.com",
+        http_client=init_http_client(),
+        max_retries=int(get_setting("llm_max_retries", 3)),
+    )
+
+# Cache disque des réponses, partagé par toutes les sessions
+@st.cache_resource
+def init_llm_cache(directory: str, ttl_seconds: int, max_entries: int, max_mb: int):
+    return LLMResponseCache(
+        directory,
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+        max_bytes=max_mb * 1024 * 1024,
+    )
+
+def get_llm_cache():
+    """Retourne le cache des réponses, ou None s'il est désactivé."""
+    if not setting_enabled("llm_cache_enabled", True):
+        return None
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_llm")
+    return init_llm_cache(
+        str(get_setting("llm_cache_dir", default_dir)),
+        int(get_setting("llm_cache_ttl_seconds", 7 * 24 * 3600)),
+        int(get_setting("llm_cache_max_entries", 500)),
+        int(get_setting("llm_cache_max_mb", 50)),
     )
 
 client = None
 
+# Réponses de la session dans un tableau compact de 36 octets, avec les sommes
+# et nombres par rubrique mis à jour à chaque réponse : scores, progression et
+# complétude y sont lus
+def get_score_aggregate() -> ScoreAggregate:
+    if 'score_aggregate' not in st.session_state:
+        # Reprise des anciennes clés f"{rubrique}_{i}" d'une session en cours
+        st.session_state['score_aggregate'] = ScoreAggregate(st.session_state)
+        for competence, i in QUESTION_INDEX:
+            st.session_state.pop(question_key(competence, i), None)
+    return st.session_state['score_aggregate']
+
+def get_answer(competence, index):
+    return get_score_aggregate().get(competence, index)
+
+# Rapport mémoire de la session : taille estimée et clés les plus lourdes
+def session_memory_report(top: int = 8) -> dict:
+    sizes = {key: metrics.deep_sizeof(value) for key, value in st.session_state.to_dict().items()}
+    largest = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {"keys": len(sizes), "total_bytes": sum(sizes.values()), "largest": dict(largest)}
+
+# Sauvegarde des sessions sous un code de reprise (écritures différées). Avec un
+# backend partagé (fichiers sur un volume commun ou Redis), n'importe quel
+# réplica reprend une session à partir du code présent dans l'URL.
+@st.cache_resource
+def init_session_store(backend: str, directory: str, url: str, ttl_seconds: int, flush_ms: int):
+    return SessionStore(
+        make_backend(backend, ttl_seconds, directory=directory, url=url),
+        flush_interval=flush_ms / 1000,
+    )
+
+def get_session_store():
+    """Retourne le stockage des sessions, ou None s'il est désactivé."""
+    if not setting_enabled("session_store_enabled", True):
+        return None
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sessions")
+    return init_session_store(
+        str(get_setting("session_store_backend", "sqlite")),
+        str(get_setting("session_store_dir", default_dir)),
+        str(get_setting("session_store_url", "redis://localhost:6379/0")),
+        int(get_setting("session_store_ttl_seconds", 30 * 24 * 3600)),
+        int(get_setting("session_store_flush_ms", 500)),
+    )
+
+# Données sauvegardées : profil, textes générés, conversation et valeurs des
+# champs de la barre latérale (les réponses sont dans l'agrégat)
+SAVED_KEYS = (
+    "nom", "age", "secteur", "experience", "profil_calcule",
+    "reco_sommaire_text", "reco_pack", "plan_90_text",
+    "Fatouma_chat", "Fatouma_summary", "coaching_journal",
+    "nom_input", "age_input", "secteur_select", "secteur_custom", "experience_select", "app_lang",
+)
+
+def session_snapshot() -> str:
+    state = {key: st.session_state[key] for key in SAVED_KEYS if key in st.session_state}
+    snapshot = {"answers": list(get_score_aggregate().answers), "state": state}
+    return json.dumps(snapshot, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+def restore_session(data: str) -> None:
+    """Réhydrate la session sans rien régénérer (textes repris tels quels)."""
+    snapshot = json.loads(data)
+    st.session_state['score_aggregate'] = ScoreAggregate([value or None for value in snapshot["answers"]])
+    # La session reprise remplace la session en cours : aucune donnée de celle-ci ne subsiste
+    for key in SAVED_KEYS:
+        st.session_state.pop(key, None)
+    st.session_state.update(snapshot["state"])
+    st.session_state['_session_saved'] = data
+
+def save_session() -> None:
+    """Planifie la sauvegarde de la session si elle a changé (sans attendre le disque)."""
+    store = get_session_store()
+    token = st.session_state.get('_session_token')
+    if store is None or token is None:
+        return
+    data = session_snapshot()
+    if data != st.session_state.get('_session_saved'):
+        store.save(token, data)
+        st.session_state['_session_saved'] = data
+
+def resume_session() -> None:
+    """Au premier passage : reprend la session du code présent dans l'URL, ou en crée un."""
+    store = get_session_store()
+    if store is None or '_session_token' in st.session_state:
+        return
+    token = st.query_params.get("reprise")
+    data = store.load(token) if token else None
+    if data is not None:
+        restore_session(data)
+    else:
+        token = secrets.token_urlsafe(9)
+        st.query_params["reprise"] = token
+    st.session_state['_session_token'] = token
+
+def resume_from_code() -> None:
+    """Reprise avec un code saisi dans la barre latérale."""
+    token = st.session_state.get('resume_code_input', "").strip()
+    store = get_session_store()
+    data = store.load(token) if store is not None and token else None
+    if data is None:
+        st.session_state['_resume_error'] = True
+        return
+    restore_session(data)
+    st.session_state['_session_token'] = token
+    st.query_params["reprise"] = token
+
 # Fonctions utilitaires pour la gestion des compétences
 def is_competence_completed(competence):
     """Vérifie si une rubrique est complétée"""
-    for i in range(len(COMPETENCES[competence]["questions"])):
-        selected_key = f"{competence}_{i}"
-        if st.session_state.get(selected_key) is None:
-            return False
-    return True
+    return get_score_aggregate().is_completed(competence)
 
 def all_competences_completed():
     """Vérifie si toutes les rubriques sont complétées"""
-    return all(is_competence_completed(comp) for comp in COMPETENCES.keys())
+    return get_score_aggregate().all_completed()
 
 def next_uncompleted_competence(current_comp):
     """Obtient la prochaine rubrique non complétée"""
@@ -476,40 +665,346 @@ def tous_formulaires_remplis(nom, secteur, experience, scores):
     
     return info_complete and competences_complete
 
-# Fonction pour générer des recommandations avec streaming
-def generate_recommendations_stream(prompt, temperature=0.7):
-    # Lecture de la clé API depuis secrets.toml ou variable d'environnement
+# Enregistre une réponse avant l'exécution du fragment (aucun st.rerun nécessaire).
+# L'application complète n'est réexécutée que si la rubrique est complète :
+# c'est seulement alors que scores, profil et onglets peuvent changer.
+def enregistrer_reponse(competence, index, val):
+    get_score_aggregate().set(competence, index, val)
+    if is_competence_completed(competence):
+        st.session_state['_grille_full_rerun'] = True
+
+# Affiche une autre section au prochain rendu (navigation par bouton)
+def aller_a_section(section):
+    st.session_state['section_active'] = section
+
+# Grille de réponses du questionnaire : un clic sur une réponse ne réexécute
+# que ce fragment (barre de progression, rubriques et questions)
+@st.fragment
+def grille_reponses():
+    if st.session_state.pop('_grille_full_rerun', False):
+        try:
+            st.rerun()
+        except Exception:
+            st.experimental_rerun()
+    # Barre de progression globale, avec le nombre de questions répondues
+    answered_questions = get_score_aggregate().answered()
+    progress_ratio = answered_questions / TOTAL_QUESTIONS
+    progress_text = tr('questions_answered').format(answered=answered_questions, total=TOTAL_QUESTIONS)
+    st.progress(progress_ratio, text=f"{tr('progress_global')}: {progress_ratio*100:.0f}% · {progress_text}")
+    
+    # Interface avec rubriques cliquables
+    if 'selected_competence' not in st.session_state:
+        st.session_state.selected_competence = None
+    
+    # Affichage des rubriques en ligne
+    st.subheader("📋 " + tr('tab1_rubriques'))
+    
+
+    
+    # Créer des colonnes pour les boutons de rubriques
+    competence_names = list(COMPETENCES.keys())
+    cols = st.columns(3)  # 3 colonnes pour 6 rubriques
+    
+    for i, competence in enumerate(competence_names):
+        with cols[i % 3]:
+            # Vérifier si la rubrique est complétée
+            is_completed = is_competence_completed(competence)
+            
+            # Déterminer si cette rubrique est sélectionnée
+            is_selected = st.session_state.selected_competence == competence
+            
+            # Déterminer le style et le texte du bouton
+            # Vert (primary) uniquement si complétée, sinon neutre (secondary)
+            if is_completed:
+                button_text = f"{tr_comp(competence)}"
+                button_style = "primary"
+            else:
+                button_text = f"🎯 {tr_comp(competence)}"
+                button_style = "secondary"
+            
+            if st.button(
+                button_text,
+                key=f"rubrique_{competence}",
+                type=button_style,
+                use_container_width=True
+            ):
+                st.session_state.selected_competence = competence
+                try:
+                    st.rerun()
+                except Exception:
+                    st.experimental_rerun()
+    
+    # Affichage des questions pour la rubrique sélectionnée
+    if st.session_state.selected_competence:
+        st.markdown("---")
+        selected_comp = st.session_state.selected_competence
+        
+        # Titre de la rubrique sélectionnée (plus compact)
+        st.subheader(f"🎯 {tr_comp(selected_comp)}")
+        
+        # Questions de la rubrique sélectionnée (format compact)
+        with st.container():
+            # Afficher toutes les questions en format compact
+            for i, question in enumerate(COMPETENCES[selected_comp]["questions"]):
+                selected_key = f"{selected_comp}_{i}"
+                selected = get_answer(selected_comp, i)
+                
+                # Question et boutons sur la même ligne
+                col_question, col_buttons = st.columns([3, 2])
+                
+                with col_question:
+                    st.write(f"**{i+1}.** {tr_question(selected_comp, i, question)}")
+                
+                with col_buttons:
+                    cols_nums = st.columns(5)
+                    for val in range(1, 6):
+                        with cols_nums[val - 1]:
+                            st.button(
+                                str(val),
+                                key=f"{selected_key}_btn_{val}",
+                                type="primary" if selected == val else "secondary",
+                                use_container_width=True,
+                                on_click=enregistrer_reponse,
+                                args=(selected_comp, i, val),
+                            )
+                
+                # Affichage compact du statut
+                if selected is not None:
+                    st.caption(f"✅ {selected}/5")
+                else:
+                    st.caption("⏳ " + tr('to_evaluate'))
+    
+    else:
+        st.info(tr('click_rubrique_hint'))
+    
+    # Les réexécutions du fragment n'atteignent pas la fin du script
+    save_session()
+
+# Rendu par lots des réponses en streaming (intervalle réglable par stream_flush_ms)
+def make_stream_renderer(placeholder):
+    return StreamRenderer(placeholder, interval=float(get_setting("stream_flush_ms", 80)) / 1000)
+
+# Client d'analyse à partir de la clé API (secrets.toml ou variable d'environnement)
+def get_analysis_client():
     api_key = st.secrets.get("deepseek_api_key") or os.environ.get("DEEPSEEK_API_KEY")
-    local_client = init_analysis_client(api_key)
+    return init_analysis_client(api_key)
+
+# Requêtes de streaming identiques en cours regroupées sur un seul flux amont
+@st.cache_resource
+def init_singleflight():
+    return SingleFlight()
+
+# Limite commune de concurrence et de débit vers le fournisseur, avec file par priorité
+@st.cache_resource
+def init_llm_scheduler(max_concurrent: int, rate: float, burst: int):
+    return LLMScheduler(max_concurrent=max_concurrent, rate=rate, burst=burst)
+
+def get_llm_scheduler():
+    return init_llm_scheduler(
+        int(get_setting("llm_max_concurrent", 8)),
+        float(get_setting("llm_rate_per_second", 5)),
+        int(get_setting("llm_rate_burst", 10)),
+    )
+
+# Affiche la position dans la file d'attente dans un placeholder
+def show_queue_position(placeholder):
+    return lambda position: placeholder.info(tr('queue_position').format(position=position))
+
+def open_reco_stream(local_client, messages, temperature):
+    """Retourne une fonction qui ouvre le flux amont et en itère les fragments de texte."""
+    def open_stream():
+        stream = local_client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        usage_seen = False
+        try:
+            for chunk in stream:
+                # Le dernier fragment ne porte que l'usage (choices vide)
+                if getattr(chunk, "usage", None) is not None:
+                    usage_seen = True
+                    record_usage("reco", chunk.usage)
+                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+            if not usage_seen:
+                record_missing_usage("reco")
+        finally:
+            # Flux abandonné : la réponse HTTP est fermée, le fournisseur arrête la génération
+            close_upstream(stream)
+    return open_stream
+
+# Messages envoyés pour une demande de recommandations. Le fournisseur met en cache
+# le début des prompts : persona, consignes de la section et langue forment un préfixe
+# identique pour tous les utilisateurs, les données de l'entrepreneur viennent en dernier.
+def build_reco_messages(consignes, donnees):
+    return [
+        {"role": "system", "content": RECO_PERSONA},
+        {"role": "system", "content": consignes},
+        {"role": "system", "content": get_lang_directive()},
+        {"role": "user", "content": donnees},
+    ]
+
+# Fonction pour générer des recommandations avec streaming
+def generate_recommendations_stream(consignes, donnees, temperature=0.7, priority=PRIORITY_RECO):
+    messages = build_reco_messages(consignes, donnees)
+    # Une requête identique déjà traitée est rejouée directement depuis le cache
+    cache = get_llm_cache()
+    cache_key = make_cache_key(messages, LLM_MODEL, get_lang_directive(), temperature)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            placeholder = st.empty()
+            placeholder.markdown(cached)
+            return cached
+    local_client = get_analysis_client()
     if local_client is None:
         st.warning("Clé API non configurée correctement.")
         return ""
     try:
-        stream = local_client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": "Tu es un expert en entrepreneuriat et en développement des compétences entrepreneuriales au Sénégal. Tu fournis des analyses précises et des recommandations personnalisées."},
-                {"role": "system", "content": get_lang_directive()},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=temperature,
-            stream=True
-        )
-        response_text = ""
+        # Une requête identique en cours dans une autre session est suivie au lieu d'être relancée
         placeholder = st.empty()
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                response_text += chunk.choices[0].delta.content
-                placeholder.markdown(response_text)
+        scheduler = get_llm_scheduler()
+        chunks = init_singleflight().stream(
+            cache_key,
+            open_reco_stream(local_client, messages, temperature),
+            acquire=lambda: scheduler.acquire(priority, on_position=show_queue_position(placeholder)),
+        )
+        try:
+            renderer = make_stream_renderer(placeholder)
+            for text in chunks:
+                renderer.feed(text)
+        finally:
+            # Script interrompu pendant l'affichage : la session se désabonne du flux
+            chunks.close()
+        response_text = renderer.close()
+        if cache is not None and response_text:
+            cache.put(cache_key, response_text)
         return response_text
     except Exception as e:
         st.error(f"Erreur lors de la génération des recommandations: {str(e)}")
         return ""
 
+# Génération simultanée de plusieurs sections, chacune dans son placeholder
+def generate_recommendations_concurrently(prompts: dict, placeholders: dict, temperature=0.7) -> dict:
+    """Lance toutes les sections ``{section: (consignes, donnees)}`` en parallèle ; la durée totale est celle de la plus lente."""
+    lang_directive = get_lang_directive()
+    cache = get_llm_cache()
+    results = {}
+    pending = {}
+    for section, (consignes, donnees) in prompts.items():
+        messages = build_reco_messages(consignes, donnees)
+        cache_key = make_cache_key(messages, LLM_MODEL, lang_directive, temperature)
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            placeholders[section].markdown(cached)
+            results[section] = cached
+        else:
+            pending[section] = (messages, cache_key)
+    if not pending:
+        return results
+    local_client = get_analysis_client()
+    if local_client is None:
+        st.warning("Clé API non configurée correctement.")
+        return results
+
+    # Les threads ne font que lire les flux ; l'affichage reste dans le thread du script
+    chunks = queue.Queue()
+
+    flights = init_singleflight()
+    scheduler = get_llm_scheduler()
+    # Levé quand le script est interrompu : les threads abandonnent leurs flux
+    stopped = threading.Event()
+
+    def worker(section, messages, cache_key):
+        def acquire():
+            slot = scheduler.acquire(
+                PRIORITY_RECO, on_position=lambda position: chunks.put((section, QueuePosition(position)))
+            )
+            if stopped.is_set():
+                # Script interrompu pendant l'attente : la place revient aux autres sessions
+                slot.release()
+                raise CancelledError("script interrompu pendant l'attente")
+            return slot
+        # La section se termine toujours par None (succès) ou une erreur, même si le
+        # thread s'arrête autrement : la boucle d'affichage ne l'attend pas en vain
+        terminal = RuntimeError("génération interrompue")
+        try:
+            # Script déjà interrompu avant le démarrage du thread : rien à ouvrir
+            if stopped.is_set():
+                return
+            subscription = flights.stream(cache_key, open_reco_stream(local_client, messages, temperature), acquire)
+            try:
+                for text in subscription:
+                    if stopped.is_set():
+                        return
+                    chunks.put((section, text))
+            finally:
+                subscription.close()
+            terminal = None
+        except CancelledError as e:
+            # Silencieux seulement si c'est ce script qui s'est arrêté
+            terminal = None if stopped.is_set() else e
+        except Exception as e:
+            terminal = e
+        finally:
+            chunks.put((section, terminal))
+
+    pool = ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="reco")
+    try:
+        futures = [pool.submit(worker, section, messages, cache_key) for section, (messages, cache_key) in pending.items()]
+        renderers = {section: make_stream_renderer(placeholders[section]) for section in pending}
+        waiting = set(pending)
+        while waiting:
+            try:
+                section, item = chunks.get(timeout=1.0)
+            except queue.Empty:
+                # Tous les threads terminés sans tout signaler : inutile d'attendre davantage
+                if all(future.done() for future in futures) and chunks.empty():
+                    for section in waiting:
+                        placeholders[section].error("Erreur lors de la génération des recommandations: génération interrompue")
+                    break
+                continue
+            if item is None:
+                waiting.discard(section)
+                results[section] = renderers[section].close()
+                if cache is not None and results[section]:
+                    cache.put(pending[section][1], results[section])
+            elif isinstance(item, Exception):
+                waiting.discard(section)
+                placeholders[section].error(f"Erreur lors de la génération des recommandations: {str(item)}")
+            elif isinstance(item, QueuePosition):
+                placeholders[section].info(tr('queue_position').format(position=item.position))
+            else:
+                renderers[section].feed(item)
+    finally:
+        stopped.set()
+        pool.shutdown(wait=False)
+    return results
+
+# Résumé cumulatif des échanges sortis de la fenêtre du chat
+def summarize_chat_turns(local_client, previous_summary: str, new_messages) -> str:
+    transcript = "\n".join(
+        f"{'Utilisateur' if m['role'] == 'user' else 'Fatouma'}: {m['content']}" for m in new_messages
+    )
+    with get_llm_scheduler().acquire(PRIORITY_CHAT):
+        response = local_client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": "Tu résumes une conversation de coaching en entrepreneuriat. Garde les faits sur l'utilisateur, son projet, ses questions et les conseils déjà donnés. 120 mots maximum."},
+                {"role": "user", "content": f"Résumé actuel :\n{previous_summary or '(aucun)'}\n\nNouveaux échanges :\n{transcript}\n\nDonne le résumé mis à jour."},
+            ],
+            temperature=0.2,
+            stream=False,
+        )
+    record_usage("summary", getattr(response, "usage", None))
+    return response.choices[0].message.content.strip()
+
 # Chat Coach Fatouma (restriction au domaine entrepreneuriat)
 def Fatouma_chat_stream(chat_history, temperature=0.7):
-    api_key = st.secrets.get("deepseek_api_key") or os.environ.get("DEEPSEEK_API_KEY")
-    local_client = init_analysis_client(api_key)
+    local_client = get_analysis_client()
     if local_client is None:
         st.warning("Clé API non configurée correctement.")
         return ""
@@ -522,29 +1017,18 @@ def Fatouma_chat_stream(chat_history, temperature=0.7):
             "Si une question est hors de ce domaine, réponds seulement: "
             "\"Je suis Coach en entrepreneuriat. Reformule ta question dans ce domaine.\" "
             "Sois claire, concrète et adaptée au contexte sénégalais. "
-            "Si le profil de l'utilisateur est disponible, base tes conseils dessus."
+            "Si le profil de l'utilisateur est disponible, base tes conseils dessus. "
+            "Pour les ressources locales, privilégie celles du catalogue fournies."
         ),
     }
-    # Injecter le contexte du profil si disponible, sinon inviter à compléter l'évaluation
+    # Préfixe identique pour tous les utilisateurs (mis en cache par le fournisseur) ;
+    # le profil et les ressources propres à l'utilisateur sont ajoutés en fin de conversation,
+    # avant la dernière question
     messages = [system_persona, {"role": "system", "content": get_lang_directive()}]
+    donnees_utilisateur = []
     if st.session_state.get('profil_calcule', False):
-        scores = st.session_state.get('scores', {})
-        nom = st.session_state.get('nom', 'Non renseigné')
-        age = st.session_state.get('age', 'Non renseigné')
-        secteur = st.session_state.get('secteur', 'Non spécifié')
-        experience = st.session_state.get('experience', 'Non spécifiée')
-        try:
-            profil, _, _, moyenne = calculer_profil(scores)
-        except Exception:
-            profil, moyenne = "Non déterminé", 0.0
-        contexte_profil = (
-            f"Contexte utilisateur connu:\n"
-            f"- Nom: {nom}\n- Âge: {age}\n- Secteur: {secteur}\n- Expérience: {experience}\n"
-            f"- Profil: {profil}\n- Score global moyen: {moyenne:.2f}/5\n\n"
-            f"Scores par compétence:\n" +
-            "\n".join([f"- {comp}: {score:.2f}/5" for comp, score in scores.items()])
-        )
-        messages.append({"role": "system", "content": contexte_profil})
+        contexte_profil = REGISTRY.render("contexte", prompt_profile(get_score_aggregate().scores()))
+        donnees_utilisateur.append({"role": "system", "content": contexte_profil.text})
     else:
         messages.append({
             "role": "system",
@@ -552,149 +1036,139 @@ def Fatouma_chat_stream(chat_history, temperature=0.7):
                 "Le profil n'est pas encore rempli. Réponds à la question, puis invite poliment l'utilisateur à compléter l'onglet \"Évaluation\" afin d'obtenir des conseils plus personnalisés."
             )
         })
-    messages += chat_history
+    # Ressources du catalogue liées au profil et à la dernière question posée
+    question = next((m["content"] for m in reversed(chat_history) if m["role"] == "user"), "")
+    ressources = resources_block(question=question, k=1)
+    if ressources:
+        donnees_utilisateur.append({"role": "system", "content": ressources})
+    # Seuls les derniers échanges sont envoyés ; les plus anciens sont résumés
+    history_manager = ChatHistoryManager(
+        max_turns=int(get_setting("chat_history_max_turns", 6)),
+        token_budget=int(get_setting("chat_history_token_budget", 2000)),
+        summarize=lambda previous, new_messages: summarize_chat_turns(local_client, previous, new_messages),
+    )
+    if 'Fatouma_summary' not in st.session_state:
+        st.session_state['Fatouma_summary'] = {"covered": 0, "text": ""}
+    history_messages, token_report = history_manager.build(chat_history, st.session_state['Fatouma_summary'])
+    # Les données de l'utilisateur précèdent sa dernière question, qui reste le dernier message
+    last_question = max(
+        (i for i, message in enumerate(history_messages) if message["role"] == "user"),
+        default=len(history_messages),
+    )
+    messages += history_messages[:last_question] + donnees_utilisateur + history_messages[last_question:]
+    token_report["prompt_tokens"] = count_message_tokens(messages)
+    st.session_state['Fatouma_tokens'] = token_report
+    metrics.observe("chat.prompt_tokens", token_report["prompt_tokens"])
     try:
-        stream = local_client.chat.completions.create(
-            model="deepseek-chat",
-            messages=messages,
-            temperature=temperature,
-            stream=True,
-        )
-        response_text = ""
         placeholder = st.empty()
-        for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
-                response_text += chunk.choices[0].delta.content
-                placeholder.markdown(response_text)
-        return response_text
+        # La place est gardée pendant toute la lecture du flux
+        with get_llm_scheduler().acquire(PRIORITY_CHAT, on_position=show_queue_position(placeholder)):
+            stream = local_client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            renderer = make_stream_renderer(placeholder)
+            # Streamlit interrompt le script par une exception hors de la hiérarchie Exception
+            outcome = "cancelled"
+            usage_seen = False
+            try:
+                for chunk in stream:
+                    if getattr(chunk, "usage", None) is not None:
+                        usage_seen = True
+                        record_usage("chat", chunk.usage)
+                    if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                        renderer.feed(chunk.choices[0].delta.content)
+                outcome = "completed"
+                if not usage_seen:
+                    record_missing_usage("chat")
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                close_upstream(stream)
+                if outcome == "completed":
+                    record_completed("chat", renderer.text())
+                elif outcome == "cancelled":
+                    record_cancelled("chat", renderer.text())
+            return renderer.close()
     except Exception as e:
         st.error(f"Erreur lors du chat avec Fatouma: {str(e)}")
         return ""
 
-# Définition des compétences
-COMPETENCES = {
-    "Leadership": {
-        "questions": [
-            "Je prends facilement l'initiative dans un groupe",
-            "Je sais motiver et inspirer les autres",
-            "Je communique ma vision de façon claire et convaincante",
-            "Je sais prendre des décisions difficiles",
-            "Je responsabilise mon équipe et favorise l'autonomie",
-            "Je favorise la collaboration et résous les conflits efficacement"
-        ]
-    },
-    "Gestion & Délégation": {
-        "questions": [
-            "Je délègue facilement les tâches à mon équipe",
-            "Je fais confiance aux autres pour accomplir des tâches importantes",
-            "Je sais organiser et planifier efficacement",
-            "Je suis capable de suivre plusieurs projets simultanément",
-            "Je définis clairement les priorités et les échéances",
-            "Je mets en place des processus pour suivre l’avancement et la qualité"
-        ]
-    },
-    "Créativité & Innovation": {
-        "questions": [
-            "Je génère facilement des idées nouvelles",
-            "J'aime expérimenter de nouvelles approches",
-            "Je remets en question le statu quo",
-            "Je suis capable d'identifier des opportunités uniques",
-            "Je transforme des idées en solutions concrètes",
-            "J’observe le marché et j’adapte rapidement mes idées"
-        ]
-    },
-    "Réseautage & Relations": {
-        "questions": [
-            "Je construis facilement des relations professionnelles",
-            "Je maintiens un réseau actif de contacts",
-            "Je sais utiliser mon réseau pour atteindre mes objectifs",
-            "Je participe activement dans diverses communautés",
-            "Je sais entretenir des relations dans la durée",
-            "Je crée des partenariats stratégiques bénéfiques aux deux parties"
-        ]
-    },
-    "Résilience & Persévérance": {
-        "questions": [
-            "Je persiste face aux difficultés",
-            "Je maintiens mon focus sur mes objectifs à long terme",
-            "Je me relève rapidement après un échec",
-            "Je reste positif dans l'adversité",
-            "Je garde mon sang-froid sous pression",
-            "J’adapte mon plan d’action face aux imprévus sans perdre de vue mes objectifs"
-        ]
-    },
-    "Gestion Financière": {
-        "questions": [
-            "Je comprends les états financiers de base",
-            "Je sais gérer un budget efficacement",
-            "Je suis capable d'identifier des sources de financement",
-            "Je prends des décisions financières éclairées",
-            "Je planifie les flux de trésorerie à moyen terme",
-            "Je suis capable de fixer des prix rentables et compétitifs"
-        ]
-    }
-}
+# Figures mises en cache par scores et langue : elles sont construites une fois
+# puis partagées entre onglets, réexécutions et sessions (jamais modifiées ensuite)
+@st.cache_resource(max_entries=256)
+def _radar_figure(scores_items: tuple, lang: str):
+    return build_radar(scores_items, tr('radar_trace_name', lang), tr('score_label', lang))
 
-def calculer_profil(scores):
-    moyenne = sum(scores.values()) / len(scores)
-    
-    profils = [
-        (4.0, "Profil Excellence", "Entrepreneur avec des compétences très développées", "#2E7D32"),
-        (3.5, "Profil Avancé", "Entrepreneur expérimenté avec quelques axes d'amélioration", "#558B2F"),
-        (3.0, "Profil Intermédiaire", "Entrepreneur en développement avec un potentiel significatif", "#F9A825"),
-        (2.5, "Profil Émergent", "Entrepreneur débutant nécessitant un accompagnement ciblé", "#EF6C00"),
-        (0, "Profil Débutant", "Entrepreneur ayant besoin d'un accompagnement complet", "#C62828")
-    ]
-    
-    for seuil, profil, desc, couleur in profils:
-        if moyenne >= seuil:
-            return profil, desc, couleur, moyenne
-    
-    return profils[-1][1], profils[-1][2], profils[-1][3], moyenne
+@st.cache_resource(max_entries=256)
+def _heatmap_figure(scores_items: tuple, lang: str):
+    return build_heatmap(scores_items, tr('score_label', lang))
 
 def creer_diagramme_radar(scores):
     """Crée un beau diagramme radar avec Plotly"""
-    categories = list(scores.keys())
-    valeurs = list(scores.values())
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=valeurs,
-        theta=categories,
-        fill='toself',
-        name=tr('radar_trace_name'),
-        line=dict(color='rgba(102, 126, 234, 0.8)', width=1.5),
-        fillcolor='rgba(102, 126, 234, 0.35)',
-        hovertemplate=f'<b>%{{theta}}</b><br>{tr("score_label")}: %{{r:.2f}}/5<extra></extra>'
-    ))
-
-    # Supprime la ligne horizontale au milieu pour éviter de cacher des libellés
-    # fig.add_hline(y=3.0, line_dash="dash", line_color="gray", opacity=0.5)
-
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 5],
-                showline=False,
-                gridcolor='rgba(0,0,0,0.1)',
-                gridwidth=0.6,
-                tickfont=dict(size=11)
-            ),
-            angularaxis=dict(
-                rotation=90,
-                direction='clockwise',
-                tickfont=dict(size=14, color='#2c3e50')
-            )
-        ),
-        showlegend=True,
-        height=500,
-        font=dict(family="Arial, sans-serif", size=12),
-        margin=dict(l=50, r=50, t=50, b=50)
+    return _radar_figure(tuple(scores.items()), st.session_state.get('app_lang', 'Français'))
+
+def creer_heatmap(scores):
+    return _heatmap_figure(tuple(scores.items()), st.session_state.get('app_lang', 'Français'))
+
+# Image PNG du radar pour le rapport Word, rendue sans navigateur
+@st.cache_resource(max_entries=256)
+def _radar_png(scores_items: tuple, lang: str) -> bytes:
+    return render_radar_png(scores_items)
+
+def creer_radar_png(scores) -> bytes:
+    return _radar_png(tuple(scores.items()), st.session_state.get('app_lang', 'Français'))
+
+# Profil de l'entrepreneur pour les modèles de prompts (voir prompt_templates)
+def prompt_profile(scores) -> PromptProfile:
+    profil, _, _, moyenne = calculer_profil(scores)
+    return PromptProfile(
+        nom=str(st.session_state.get('nom', 'Non renseigné')),
+        age=str(st.session_state.get('age', 'Non renseigné')),
+        secteur=st.session_state.get('secteur', 'Non spécifié'),
+        experience=st.session_state.get('experience', 'Non spécifiée'),
+        profil=profil,
+        moyenne=moyenne,
+        scores=tuple(scores.items()),
     )
-    
-    return fig
+
+# Nombre de ressources du catalogue par demande (réglage prompt_resources_k par défaut, 2)
+SECTION_RESOURCES_K = {"sommaire": 1, "analyse_complete": 5}
+
+def build_section_prompt(section: str, profile: PromptProfile) -> tuple[str, str]:
+    """Retourne (consignes fixes, données de l'entrepreneur) d'une demande de recommandations."""
+    consignes = REGISTRY.render(section)
+    contexte = REGISTRY.render("contexte", profile)
+    ressources = resources_block(section, k=SECTION_RESOURCES_K.get(section))
+    donnees = f"{contexte.text}\n\n{ressources}" if ressources else contexte.text
+    # Taille de la requête envoyée : persona et consigne de langue comprises
+    metrics.observe(f"prompt.request_tokens.{section}", count_message_tokens(build_reco_messages(consignes.text, donnees)))
+    return consignes.text, donnees
+
+# Ressources du catalogue les plus proches du profil, en bloc compact pour les prompts
+def resources_block(section=None, question="", k=None) -> str:
+    if k is None:
+        k = int(get_setting("prompt_resources_k", 2))
+    if k <= 0:
+        return ""
+    profile = {"secteur": st.session_state.get('secteur', ''), "section": section, "question": question}
+    if st.session_state.get('profil_calcule', False):
+        scores = get_score_aggregate().scores()
+        profile.update(scores=scores, profil=calculer_profil(scores)[0])
+    resources = retrieve_resources(
+        get_resource_catalog().current().index,
+        k=k,
+        **profile,
+    )
+    return format_resources(resources)
+
+# Reprise d'une session sauvegardée (avant la création des champs)
+resume_session()
+st.session_state.setdefault('age_input', 30)
 
 # Interface principale
 st.title("🚀 " + tr('app_title'))
@@ -704,7 +1178,7 @@ st.markdown("### " + tr('app_tagline'))
 with st.sidebar:
     st.header(tr('sidebar_info'))
     nom = st.text_input(tr('sidebar_name'), key="nom_input")
-    age = st.number_input(tr('sidebar_age'), min_value=18, max_value=100, value=30)
+    age = st.number_input(tr('sidebar_age'), min_value=18, max_value=100, key="age_input")
     secteur_options = [
         "Agriculture", "Commerce", "Services", "Technologie",
         "Artisanat", "Transport", "Éducation", "Santé"
@@ -777,9 +1251,48 @@ with st.sidebar:
         lang = st.session_state.get('app_lang', 'Français')
         return EXPERIENCE_LABELS.get(lang, {}).get(opt, opt)
 
-    experience = st.selectbox(tr('sidebar_experience'), EXPERIENCE_OPTIONS, format_func=tr_experience)
+    experience = st.selectbox(tr('sidebar_experience'), EXPERIENCE_OPTIONS, format_func=tr_experience, key="experience_select")
     st.selectbox(tr('sidebar_language'), ["Français", "Wolof"], index=0, key="app_lang")
     # (Champ clé API supprimé)
+
+    # Code de reprise de la session (sauvegarde automatique)
+    if st.session_state.get('_session_token'):
+        with st.expander(tr('resume_title')):
+            st.markdown(tr('resume_code').format(code=st.session_state['_session_token']))
+            st.text_input(tr('resume_input'), key="resume_code_input")
+            st.button(tr('resume_button'), key="resume_button", on_click=resume_from_code)
+            if st.session_state.pop('_resume_error', False):
+                st.warning(tr('resume_not_found'))
+
+    # Statistiques techniques (activées par le paramètre show_metrics)
+    if setting_enabled("show_metrics"):
+        with st.expander("📈 Statistiques techniques"):
+            llm_cache = get_llm_cache()
+            if llm_cache is not None:
+                st.caption("Cache des réponses")
+                st.json(llm_cache.stats())
+            if "llm_transport" in sys.modules:
+                st.caption("Pool de connexions HTTP")
+                st.json(init_http_client().stats())
+            st.caption("Requêtes identiques regroupées")
+            st.json(init_singleflight().stats())
+            st.caption("File d'attente des requêtes au modèle")
+            st.json(get_llm_scheduler().stats())
+            st.caption("Modèles de prompts (tokens estimés)")
+            st.json(REGISTRY.stats())
+            st.caption("Catalogue des ressources")
+            st.json(get_resource_catalog().stats())
+            st.caption("Mesures du processus")
+            st.json(metrics.snapshot())
+            st.caption("Mémoire de la session (estimation)")
+            st.json(session_memory_report())
+            session_store = get_session_store()
+            if session_store is not None:
+                st.caption("Sauvegarde des sessions")
+                st.json(session_store.stats())
+            if st.session_state.get('Fatouma_tokens'):
+                st.caption("Dernière requête Coach Fatouma (tokens estimés)")
+                st.json(st.session_state['Fatouma_tokens'])
     
     # Signature
     st.markdown("---")
@@ -795,8 +1308,8 @@ with st.sidebar:
 # CSS personnalisé pour améliorer la visibilité des onglets
 st.markdown("""
 <style>
-/* Amélioration des onglets */
-.stTabs [data-baseweb="tab-list"] {
+/* Amélioration de la navigation entre sections (boutons radio affichés en onglets) */
+.st-key-section_active div[role="radiogroup"] {
     gap: 8px;
     background-color: #f8f9fa;
     padding: 10px;
@@ -805,7 +1318,7 @@ st.markdown("""
     box-shadow: 0 2px 10px rgba(0,0,0,0.1);
 }
 
-.stTabs [data-baseweb="tab"] {
+.st-key-section_active label[data-baseweb="radio"] {
     height: 60px;
     padding: 15px 25px;
     background-color: white;
@@ -817,7 +1330,12 @@ st.markdown("""
     box-shadow: 0 2px 5px rgba(0,0,0,0.05);
 }
 
-.stTabs [aria-selected="true"] {
+/* Masquer la pastille du bouton radio */
+.st-key-section_active label[data-baseweb="radio"] > div:first-child {
+    display: none;
+}
+
+.st-key-section_active label[data-baseweb="radio"]:has(input:checked) {
     background: linear-gradient(135deg, #007bff, #0056b3) !important;
     color: white !important;
     border-color: #007bff !important;
@@ -825,7 +1343,7 @@ st.markdown("""
     box-shadow: 0 4px 15px rgba(0,123,255,0.3) !important;
 }
 
-.stTabs [data-baseweb="tab"]:hover {
+.st-key-section_active label[data-baseweb="radio"]:hover {
     background-color: #f8f9fa;
     border-color: #007bff;
     transform: translateY(-1px);
@@ -899,6 +1417,38 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Calcul des scores pour toutes les compétences (0.0 si aucune réponse), avant
+# la navigation : la barre latérale peut modifier le profil depuis toute section
+scores = get_score_aggregate().scores()
+# Vérification automatique et calcul du profil
+formulaires_remplis = tous_formulaires_remplis(nom, secteur, experience, scores)
+
+if formulaires_remplis:
+    # Mise à jour automatique du profil à chaque modification des informations
+    # (les scores sont lus dans l'agrégat des réponses, sans copie à tenir à jour)
+    info_changed = (st.session_state.get('nom') != nom or 
+                   st.session_state.get('age') != age or 
+                   st.session_state.get('secteur') != secteur or 
+                   st.session_state.get('experience') != experience)
+    
+    # Recalculer si c'est la première fois ou si quelque chose a changé
+    if not st.session_state.get('profil_calcule', False) or info_changed:
+        st.session_state.profil_calcule = True
+        st.session_state.nom = nom
+        st.session_state.age = age
+        st.session_state.secteur = secteur
+        st.session_state.experience = experience
+        
+        if not st.session_state.get('profil_calcule', False):
+            st.success("🎉 Profil calculé automatiquement ! Consultez l'onglet 'Résultats' pour voir vos graphiques et recommandations.")
+        else:
+            st.info("🔄 Profil mis à jour automatiquement suite à vos modifications.")
+        
+        try:
+            st.rerun()
+        except Exception:
+            st.experimental_rerun()
+
 # Déterminer l'état des onglets
 evaluation_complete = st.session_state.get('profil_calcule', False)
 results_available = evaluation_complete
@@ -925,150 +1475,25 @@ elif evaluation_complete:
 else:
     tab3_label += " 🔒"
 
-# Tabs pour l'interface avec labels améliorés
+# Navigation entre sections avec labels améliorés : seule la section active est
+# exécutée (st.tabs exécuterait les quatre à chaque réexécution)
 tab4_label = "👩🏾‍💼 " + tr('tab_adja')
-tab1, tab2, tab3, tab4 = st.tabs([tab1_label, tab2_label, tab3_label, tab4_label])
+SECTIONS = {"eval": tab1_label, "results": tab2_label, "reco": tab3_label, "adja": tab4_label}
+section_active = st.radio(
+    "Navigation",
+    list(SECTIONS),
+    format_func=SECTIONS.get,
+    horizontal=True,
+    key="section_active",
+    label_visibility="collapsed",
+)
 
-with tab1:
+if section_active == "eval":
     st.header(tr('tab1_header'))
     st.markdown("*" + tr('tab1_instruction') + "*")
-    # Barre de progression globale
-    total_questions = sum(len(data["questions"]) for data in COMPETENCES.values())
-    answered_questions = sum(1 for comp, data in COMPETENCES.items() for i in range(len(data["questions"])) if st.session_state.get(f"{comp}_{i}") is not None)
-    progress_ratio = (answered_questions / total_questions) if total_questions else 0
-    st.progress(progress_ratio, text=f"{tr('progress_global')}: {progress_ratio*100:.0f}%")
-    
-    # Interface avec rubriques cliquables
-    if 'selected_competence' not in st.session_state:
-        st.session_state.selected_competence = None
-    
-    # Affichage des rubriques en ligne
-    st.subheader("📋 " + tr('tab1_rubriques'))
-    
-
-    
-    # Créer des colonnes pour les boutons de rubriques
-    competence_names = list(COMPETENCES.keys())
-    cols = st.columns(3)  # 3 colonnes pour 6 rubriques
-    
-    for i, competence in enumerate(competence_names):
-        with cols[i % 3]:
-            # Vérifier si la rubrique est complétée
-            is_completed = is_competence_completed(competence)
-            
-            # Déterminer si cette rubrique est sélectionnée
-            is_selected = st.session_state.selected_competence == competence
-            
-            # Déterminer le style et le texte du bouton
-            # Vert (primary) uniquement si complétée, sinon neutre (secondary)
-            if is_completed:
-                button_text = f"{tr_comp(competence)}"
-                button_style = "primary"
-            else:
-                button_text = f"🎯 {tr_comp(competence)}"
-                button_style = "secondary"
-            
-            if st.button(
-                button_text,
-                key=f"rubrique_{competence}",
-                type=button_style,
-                use_container_width=True
-            ):
-                st.session_state.selected_competence = competence
-                try:
-                    st.rerun()
-                except Exception:
-                    st.experimental_rerun()
-    
-    # Affichage des questions pour la rubrique sélectionnée
-    if st.session_state.selected_competence:
-        st.markdown("---")
-        selected_comp = st.session_state.selected_competence
-        
-        # Titre de la rubrique sélectionnée (plus compact)
-        st.subheader(f"🎯 {tr_comp(selected_comp)}")
-        
-        # Questions de la rubrique sélectionnée (format compact)
-        with st.container():
-            # Afficher toutes les questions en format compact
-            for i, question in enumerate(COMPETENCES[selected_comp]["questions"]):
-                selected_key = f"{selected_comp}_{i}"
-                selected = st.session_state.get(selected_key)
-                
-                # Question et boutons sur la même ligne
-                col_question, col_buttons = st.columns([3, 2])
-                
-                with col_question:
-                    st.write(f"**{i+1}.** {tr_question(selected_comp, i, question)}")
-                
-                with col_buttons:
-                    cols_nums = st.columns(5)
-                    for val in range(1, 6):
-                        with cols_nums[val - 1]:
-                            if st.button(
-                                str(val),
-                                key=f"{selected_key}_btn_{val}",
-                                type="primary" if selected == val else "secondary",
-                                use_container_width=True,
-                            ):
-                                st.session_state[selected_key] = val
-                                try:
-                                    st.rerun()
-                                except Exception:
-                                    st.experimental_rerun()
-                
-                # Affichage compact du statut
-                if selected is not None:
-                    st.caption(f"✅ {selected}/5")
-                else:
-                    st.caption("⏳ " + tr('to_evaluate'))
-    
-    else:
-        st.info(tr('click_rubrique_hint'))
-    
-    # Calcul des scores pour toutes les compétences
-    scores = {}
-    
-    for competence, data in COMPETENCES.items():
-        questions_scores = []
-        for i, question in enumerate(data["questions"]):
-            selected_key = f"{competence}_{i}"
-            selected = st.session_state.get(selected_key)
-            if selected is not None:
-                questions_scores.append(selected)
-        
-        # Moyenne par compétence (0.0 si aucune réponse)
-        scores[competence] = (sum(questions_scores) / len(questions_scores)) if questions_scores else 0.0
-    # Vérification automatique et calcul du profil
-    formulaires_remplis = tous_formulaires_remplis(nom, secteur, experience, scores)
+    grille_reponses()
     
     if formulaires_remplis:
-        # Mise à jour automatique du profil à chaque modification
-        scores_changed = st.session_state.get('scores') != scores
-        info_changed = (st.session_state.get('nom') != nom or 
-                       st.session_state.get('age') != age or 
-                       st.session_state.get('secteur') != secteur or 
-                       st.session_state.get('experience') != experience)
-        
-        # Recalculer si c'est la première fois ou si quelque chose a changé
-        if not st.session_state.get('profil_calcule', False) or scores_changed or info_changed:
-            st.session_state.scores = scores
-            st.session_state.profil_calcule = True
-            st.session_state.nom = nom
-            st.session_state.age = age
-            st.session_state.secteur = secteur
-            st.session_state.experience = experience
-            
-            if not st.session_state.get('profil_calcule', False):
-                st.success("🎉 Profil calculé automatiquement ! Consultez l'onglet 'Résultats' pour voir vos graphiques et recommandations.")
-            else:
-                st.info("🔄 Profil mis à jour automatiquement suite à vos modifications.")
-            
-            try:
-                st.rerun()
-            except Exception:
-                st.experimental_rerun()
-        
         # Affichage du statut de completion
         col1, col2, col3 = st.columns(3)
         with col2:
@@ -1086,19 +1511,10 @@ with tab1:
             </div>
             """, unsafe_allow_html=True)
     else:
-        # Affichage du bouton désactivé avec indication du progrès
+        # Invitation à compléter le questionnaire ; la progression est affichée par la
+        # grille (fragment), seule à jour pendant une rubrique
         col1, col2, col3 = st.columns(3)
         with col2:
-            # Calcul du pourcentage de completion
-            total_questions = sum(len(data["questions"]) for data in COMPETENCES.values())
-            answered_questions = sum(1 for competence, data in COMPETENCES.items() 
-                                   for i in range(len(data["questions"])) 
-                                   if st.session_state.get(f"{competence}_{i}") is not None)
-            
-            # Calcul du pourcentage de progression basé sur les questions répondues
-            progress_text = tr('questions_answered').format(answered=answered_questions, total=total_questions)
-            progress_percent = (answered_questions / total_questions) * 100 if total_questions > 0 else 0
-            
             st.markdown(f"""
             <div style="
                 background: #f8f9fa;
@@ -1109,11 +1525,7 @@ with tab1:
                 text-align: center;
                 font-weight: bold;
             ">
-                🔄 {tr('complete_info')}<br>
-                <small>{progress_text}</small><br>
-                <div style="background: #e9ecef; border-radius: 10px; height: 8px; margin: 10px 0;">
-                    <div style="background: #007bff; height: 100%; width: {progress_percent}%; border-radius: 10px;"></div>
-                </div>
+                🔄 {tr('complete_info')}
             </div>
             """, unsafe_allow_html=True)
     with col3:
@@ -1130,17 +1542,17 @@ with tab1:
     # Résumé rapide directement sous le bouton pour éviter de remonter
     if st.session_state.get('profil_calcule'):
         st.markdown("### " + tr('resume_rapide'))
-        profil, description, couleur, moyenne = calculer_profil(st.session_state.scores)
+        profil, description, couleur, moyenne = calculer_profil(scores)
         c1, c2, c3 = st.columns(3)
         with c1:
             st.metric(tr('score_global'), f"{moyenne:.2f}/5")
         with c2:
             st.markdown(f"<div style='text-align: center; padding: 12px; background: {couleur}22; border-radius: 8px; border-left: 4px solid {couleur}'><b style='color: {couleur}'>{profil}</b></div>", unsafe_allow_html=True)
         with c3:
-            pf = sum(1 for s in st.session_state.scores.values() if s >= 4.0)
-            st.metric(tr('points_forts'), f"{pf}/{len(st.session_state.scores)}")
+            pf = sum(1 for s in scores.values() if s >= 4.0)
+            st.metric(tr('points_forts'), f"{pf}/{len(scores)}")
         # Mini-diagramme
-        st.plotly_chart(creer_diagramme_radar(st.session_state.scores), use_container_width=True, key="radar_summary_tab1")
+        st.plotly_chart(creer_diagramme_radar(scores), use_container_width=True, key="radar_summary_tab1")
         # Info + lien de remontée
         cInfo, cBtn = st.columns([3, 1])
         with cInfo:
@@ -1187,9 +1599,9 @@ with tab1:
         </div>
         """, unsafe_allow_html=True)
 
-with tab2:
+if section_active == "results":
     if 'profil_calcule' in st.session_state and st.session_state.profil_calcule:
-        scores = st.session_state.scores
+        scores = get_score_aggregate().scores()
         nom = st.session_state.get('nom', tr('non_renseigne'))
         
         # Saisie optionnelle du nom de l'entreprise
@@ -1221,14 +1633,7 @@ with tab2:
         
         # 🔥 Heatmap des compétences
         st.markdown("### " + tr('heatmap_comp_title'))
-        heatmap_fig = go.Figure(data=go.Heatmap(
-            z=[list(scores.values())],
-            x=list(scores.keys()),
-            y=[tr('score_label')],
-            colorscale='YlOrRd', zmin=0, zmax=5, showscale=True
-        ))
-        heatmap_fig.update_layout(height=180, margin=dict(l=10, r=10, t=10, b=10))
-        st.plotly_chart(heatmap_fig, use_container_width=True)
+        st.plotly_chart(creer_heatmap(scores), use_container_width=True)
 
         # 🏅 Badges
         st.markdown("### 🏅 Badges")
@@ -1243,40 +1648,20 @@ with tab2:
             st.info("Complétez l'évaluation pour débloquer des badges.")
 
         # 💾 Export CSV des scores
-        st.download_button(
-            label="💾 Télécharger Scores (CSV)",
-            data=make_scores_csv(scores),
-            file_name=f"scores_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            key="dl_scores_csv"
+        export_download_button(
+            "💾 Télécharger Scores (CSV)",
+            content_key("csv", *scores.items()),
+            lambda: make_scores_csv(scores),
+            f"scores_{datetime.now().strftime('%Y%m%d')}.csv",
+            "text/csv",
+            "dl_scores_csv"
         )
         
         # Bouton unique pleine largeur pour déclencher les recommandations sommaires
         if st.button("💡 Recommandations Sommaires - Cliquez ici !", type="primary", use_container_width=True, key="reco_sommaire_duplicate", help="Obtenez des recommandations personnalisées basées sur votre profil"):
                 st.subheader("💡 Recommandations Personnalisées")
                 with st.spinner("Génération des recommandations en cours..."):
-                    # Préparer le contexte pour l'analyse
-                    contexte_sommaire = f"""
- Profil entrepreneur: {profil}
- Score global: {sum(scores.values()) / len(scores):.2f}/5
- Secteur: {st.session_state.get('secteur', 'Non spécifié')}
- Expérience: {st.session_state.get('experience', 'Non spécifiée')}
- 
- Scores détaillés:
- """
-                    for comp, score in scores.items():
-                        contexte_sommaire += f"- {comp}: {score:.2f}/5\n"
-                    prompt_sommaire = f"""{contexte_sommaire}
-
-En tant qu'expert en entrepreneuriat au Sénégal, fournis 3-4 recommandations courtes et concrètes (maximum 150 mots) pour cet entrepreneur basées sur son profil.
-
-Focus sur:
-1. Les 2 compétences les plus faibles à améliorer en priorité
-2. Une action concrète à mettre en place dans les 30 prochains jours
-3. Une ressource ou contact utile au Sénégal
-
-Sois direct, actionnable et adapté au contexte sénégalais."""
-                    reponse_sommaire = generate_recommendations_stream(prompt_sommaire)
+                    reponse_sommaire = generate_recommendations_stream(*build_section_prompt("sommaire", prompt_profile(scores)))
                     st.session_state['reco_sommaire_text'] = reponse_sommaire
                     st.success("✅ Recommandations sommaires enregistrées pour le rapport.")
         
@@ -1435,48 +1820,16 @@ Sois direct, actionnable et adapté au contexte sénégalais."""
         }
         
         # Générer un rapport Word avec image du radar
-
-        if st.button("📝 Générer le rapport Word", type="primary", use_container_width=True, key="btn_gen_word_duplicate"):
-            buf = io.BytesIO()
-            
-            doc = Document()
-            doc.add_heading("Rapport de Profilage Entrepreneurial", level=1)
-            doc.add_paragraph(datetime.now().strftime("%Y-%m-%d %H:%M"))
-            
-            doc.add_heading("Informations", level=2)
-            doc.add_paragraph(f"Nom: {rapport['nom']}")
-            doc.add_paragraph(f"Entreprise: {rapport['entreprise']}")
-            doc.add_paragraph(f"Âge: {rapport['age']}")
-            doc.add_paragraph(f"Secteur: {rapport['secteur']}")
-            doc.add_paragraph(f"Expérience: {rapport['experience']}")
-            
-            doc.add_heading("Synthèse du Profil", level=2)
-            doc.add_paragraph(f"Profil: {rapport['profil']}")
-            doc.add_paragraph(rapport['description'])
-            
-            doc.add_heading("Scores par Compétence", level=2)
-            for comp, sc in rapport['scores'].items():
-                doc.add_paragraph(f"- {comp}: {sc:.2f}/5")
-            
-            # Note: Image radar supprimée pour éviter les lenteurs de calcul
-            doc.add_heading("Cartographie des Compétences", level=2)
-            doc.add_paragraph("Consultez l'application pour visualiser le diagramme radar interactif.")
-            
-            # Inclure les recommandations sommaires seulement si générées
-            reco_text = st.session_state.get('reco_sommaire_text')
-            if reco_text and reco_text.strip():
-                doc.add_heading("Recommandations Sommaires", level=2)
-                for line in reco_text.splitlines():
-                    doc.add_paragraph(line)
-            
-            doc.save(buf)
-            buf.seek(0)
-            
+        reco_text = st.session_state.get('reco_sommaire_text')
+        rapport_key = content_key("rapport", *rapport.items(), reco_text)
+        export_cache = init_export_cache()
+        if st.button("📝 Générer le rapport Word", type="primary", use_container_width=True, key="btn_gen_word_duplicate") or export_cache.get(rapport_key) is not None:
             st.download_button(
                 label="💾 Télécharger mon rapport (Word)",
-                data=buf.getvalue(),
+                data=export_cache.get_or_build(rapport_key, lambda: make_rapport_docx(rapport, reco_text, creer_radar_png(scores))),
                 file_name=f"rapport_profil_{datetime.now().strftime('%Y%m%d')}.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                mime=DOCX_MIME,
+                on_click="ignore"
             )
         
         # Message de navigation vers les recommandations
@@ -1489,11 +1842,11 @@ Sois direct, actionnable et adapté au contexte sénégalais."""
     else:
         st.info(tr('goto_eval_warning'))
 
-with tab3:
+if section_active == "reco":
     if 'profil_calcule' in st.session_state and st.session_state.profil_calcule:
         st.header("💡 " + tr('tab_reco'))
         
-        scores = st.session_state.scores
+        scores = get_score_aggregate().scores()
         nom = st.session_state.get('nom', 'Non renseigné')
         age = st.session_state.get('age', 30)
         secteur = st.session_state.get('secteur', 'Non spécifié')
@@ -1502,19 +1855,64 @@ with tab3:
         
         st.markdown("### Analyse approfondie et recommandations personnalisées")
         
-        # Préparer le contexte
-        contexte = f"""
-Contexte de l'entrepreneur:
-- Nom: {nom}
-- Âge: {age}
-- Secteur: {secteur}
-- Expérience: {experience}
-- Profil identifié: {profil}
-
-Scores par compétence:
-"""
-        for comp, score in scores.items():
-            contexte += f"- {comp}: {score:.2f}/5\n"
+        # Profil de l'entrepreneur pour les prompts ; son contexte rendu identifie le pack généré
+        profile = prompt_profile(scores)
+        contexte = REGISTRY.render("contexte", profile).text
+        
+        # ⚡ Pack complet : toutes les sections générées en parallèle
+        section_titles = {
+            "formation": "📚 Plan de Formation Personnalisé",
+            "strategie": "🎯 Stratégie de Développement",
+            "mentorat": tr('mentorat_button'),
+            "financement": tr('financement_button'),
+            "plan_90": tr('plan_action_90_title'),
+        }
+        section_doc_titles = {
+            "formation": "Plan de Formation Personnalisé",
+            "strategie": "Stratégie de Développement",
+            "mentorat": tr('doc_title_mentorat'),
+            "financement": tr('doc_title_financement'),
+            "plan_90": tr('plan_action_90_title'),
+        }
+        section_files = {
+            "formation": "plan_formation",
+            "strategie": "strategie_developpement",
+            "mentorat": "recommandations_mentorat",
+            "financement": "opportunites_financement",
+            "plan_90": "plan_90_jours",
+        }
+        reco_pack = st.session_state.get('reco_pack')
+        if reco_pack and (reco_pack['contexte'] != contexte or reco_pack['lang'] != st.session_state.get('app_lang')):
+            reco_pack = None
+        if st.button(tr('generate_all_button'), use_container_width=True, key="reco_pack_generate"):
+            containers = {}
+            placeholders = {}
+            for section, title in section_titles.items():
+                containers[section] = st.container()
+                with containers[section]:
+                    st.subheader(title)
+                    placeholders[section] = st.empty()
+            with st.spinner(tr('generating')):
+                prompts = {section: build_section_prompt(section, profile) for section in section_titles}
+                sections = generate_recommendations_concurrently(prompts, placeholders)
+            st.session_state['reco_pack'] = {
+                "contexte": contexte,
+                "lang": st.session_state.get('app_lang'),
+                "sections": sections,
+            }
+            if sections.get('plan_90'):
+                st.session_state['plan_90_text'] = sections['plan_90']
+            for section, text in sections.items():
+                with containers[section]:
+                    afficher_telechargements(text, section_files[section], section_doc_titles[section], f"dl_pack_{section}", lazy=True)
+        elif reco_pack:
+            # Résultats conservés d'une génération précédente
+            for section, title in section_titles.items():
+                text = reco_pack['sections'].get(section)
+                if text:
+                    with st.expander(title):
+                        st.markdown(text)
+                        afficher_telechargements(text, section_files[section], section_doc_titles[section], f"dl_pack_{section}", lazy=True)
         
         # Boutons pour recommandations avec colonnes
         col1, col2 = st.columns(2)
@@ -1523,78 +1921,23 @@ Scores par compétence:
             if st.button("📚 Plan de Formation Personnalisé", use_container_width=True, key="formation"):
                 st.subheader("📚 Plan de Formation Personnalisé")
                 with st.spinner("Génération en cours..."):
-                    prompt = f"""{contexte}
-
-En tant qu'expert en formation entrepreneuriale au Sénégal, propose un plan de formation détaillé et personnalisé pour cet entrepreneur. 
-Inclus:
-1. Les domaines prioritaires à développer
-2. Des formations spécifiques recommandées (disponibles au Sénégal)
-3. Un calendrier suggéré sur 6-12 mois
-4. Des ressources locales (organisations, programmes, institutions sénégalaises)
-
-RESSOURCES SPÉCIFIQUES À MENTIONNER SI PERTINENTES :
-        - Daaray Jàmbaar Yi (CBAO Groupe Attijariwafa bank) : centre d'accompagnement offrant formations entrepreneuriales, coaching personnalisé, aide au montage de projets, business plans, et facilitation d'accès au financement. Idéal pour initiation à l'entrepreneuriat, modules spécialisés (business model, gestion d'entreprise, éducation financière) et accompagnement des TPME/PME.
-        - ONFP — Office National de Formation Professionnelle : programmes de formation professionnelle, certifications, apprentissage technique et reconversion, adaptés au développement des compétences métiers.
-        NOTE FORMATION : ADEPME n’offre plus de formation ; ne pas la recommander pour ce volet."""
+                    consignes, donnees = build_section_prompt("formation", profile)
                     
-                    reponse_formation = generate_recommendations_stream(prompt)
+                    reponse_formation = generate_recommendations_stream(consignes, donnees)
                     
                     # Boutons de téléchargement
-                    col_txt, col_word = st.columns(2)
-                    with col_txt:
-                        st.download_button(
-                            label="💾 Télécharger en TXT",
-                            data=reponse_formation,
-                            file_name=f"plan_formation_{datetime.now().strftime('%Y%m%d')}.txt",
-                            mime="text/plain",
-                            key="dl_formation_txt"
-                        )
-                    with col_word:
-                        st.download_button(
-                            label="📄 Télécharger en Word",
-                            data=make_docx("Plan de Formation Personnalisé", reponse_formation),
-                            file_name=f"plan_formation_{datetime.now().strftime('%Y%m%d')}.docx",
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            key="dl_formation_word"
-                        )
+                    afficher_telechargements(reponse_formation, "plan_formation", "Plan de Formation Personnalisé", "dl_formation")
         
         with col2:
             if st.button("🎯 Stratégie de Développement", use_container_width=True, key="strategie"):
                 st.subheader("🎯 Stratégie de Développement")
                 with st.spinner("Génération en cours..."):
-                    prompt = f"""{contexte}
-
-En tant qu'expert en développement entrepreneurial, propose une stratégie de développement sur mesure pour cet entrepreneur sénégalais.
-Inclus:
-1. Des objectifs SMART à court terme (3 mois)
-2. Des objectifs à moyen terme (6-12 mois)
-3. Des actions concrètes et mesurables
-4. Des indicateurs de succès
-5. Des opportunités spécifiques au contexte sénégalais
-
-RESSOURCES SPÉCIFIQUES À MENTIONNER SI PERTINENTES :
-- Daaray Jàmbaar Yi (CBAO Groupe Attijariwafa bank) : pour coaching personnalisé, mentorat par des professionnels bancaires, conseils pour optimiser l'accès au financement, et networking avec chefs d'entreprise et investisseurs."""
+                    consignes, donnees = build_section_prompt("strategie", profile)
                     
-                    reponse_strategie = generate_recommendations_stream(prompt)
+                    reponse_strategie = generate_recommendations_stream(consignes, donnees)
                     
                     # Boutons de téléchargement
-                    col_txt, col_word = st.columns(2)
-                    with col_txt:
-                        st.download_button(
-                            label="💾 Télécharger en TXT",
-                            data=reponse_strategie,
-                            file_name=f"strategie_developpement_{datetime.now().strftime('%Y%m%d')}.txt",
-                            mime="text/plain",
-                            key="dl_strategie_txt"
-                        )
-                    with col_word:
-                        st.download_button(
-                            label="📄 Télécharger en Word",
-                            data=make_docx("Stratégie de Développement", reponse_strategie),
-                            file_name=f"strategie_developpement_{datetime.now().strftime('%Y%m%d')}.docx",
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            key="dl_strategie_word"
-                        )
+                    afficher_telechargements(reponse_strategie, "strategie_developpement", "Stratégie de Développement", "dl_strategie")
         
         col3, col4 = st.columns(2)
         
@@ -1602,77 +1945,23 @@ RESSOURCES SPÉCIFIQUES À MENTIONNER SI PERTINENTES :
             if st.button(tr('mentorat_button'), use_container_width=True, key="mentorat"):
                 st.subheader(tr('mentorat_button'))
                 with st.spinner(tr('generating')):
-                    prompt = f"""{contexte}
-
-Recommande un programme de mentorat adapté à cet entrepreneur sénégalais.
-Inclus:
-1. Le type de mentor idéal (profil, expérience)
-2. Les domaines où le mentorat est le plus nécessaire
-3. Des programmes de mentorat disponibles au Sénégal
-4. Comment tirer le meilleur parti du mentorat
-5. Des structures d'accompagnement locales (incubateurs, accélérateurs)
-
-RESSOURCES SPÉCIFIQUES À MENTIONNER SI PERTINENTES :
-- Daaray Jàmbaar Yi (CBAO Groupe Attijariwafa bank) : offre mentorat par des professionnels du secteur bancaire et de l'entreprise, suivi individuel des porteurs de projet, sessions de rencontres avec chefs d'entreprise et investisseurs, et plateforme d'échanges entre entrepreneurs."""
+                    consignes, donnees = build_section_prompt("mentorat", profile)
                     
-                    reponse_mentorat = generate_recommendations_stream(prompt)
+                    reponse_mentorat = generate_recommendations_stream(consignes, donnees)
                     
                     # Boutons de téléchargement
-                    col_txt, col_word = st.columns(2)
-                    with col_txt:
-                        st.download_button(
-                            label=tr('download_txt'),
-                            data=reponse_mentorat,
-                            file_name=f"recommandations_mentorat_{datetime.now().strftime('%Y%m%d')}.txt",
-                            mime="text/plain",
-                            key="dl_mentorat_txt"
-                        )
-                    with col_word:
-                        st.download_button(
-                            label=tr('download_word'),
-                            data=make_docx(tr('doc_title_mentorat'), reponse_mentorat),
-                            file_name=f"recommandations_mentorat_{datetime.now().strftime('%Y%m%d')}.docx",
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            key="dl_mentorat_word"
-                        )
+                    afficher_telechargements(reponse_mentorat, "recommandations_mentorat", tr('doc_title_mentorat'), "dl_mentorat")
         
         with col4:
             if st.button(tr('financement_button'), use_container_width=True, key="financement"):
                 st.subheader(tr('financement_button'))
                 with st.spinner("Génération en cours..."):
-                    prompt = f"""{contexte}
-
-Identifie les opportunités de financement adaptées à cet entrepreneur sénégalais.
-Inclus:
-1. Les types de financement recommandés selon son profil
-2. Des programmes de financement disponibles au Sénégal
-3. Les critères d'éligibilité typiques
-4. Comment renforcer sa candidature
-5. Des alternatives au financement traditionnel
-
-RESSOURCES SPÉCIFIQUES À MENTIONNER SI PERTINENTES :
-- Daaray Jàmbaar Yi (CBAO Groupe Attijariwafa bank) : facilite l'accès au crédit et aux services bancaires, partenariats privilégiés avec la CBAO pour TPME/PME, information sur produits bancaires adaptés aux petites structures, et appui pour monter un dossier de crédit ou de financement adapté."""
+                    consignes, donnees = build_section_prompt("financement", profile)
                     
-                    reponse_financement = generate_recommendations_stream(prompt)
+                    reponse_financement = generate_recommendations_stream(consignes, donnees)
                     
                     # Boutons de téléchargement
-                    col_txt, col_word = st.columns(2)
-                    with col_txt:
-                        st.download_button(
-                            label=tr('download_txt'),
-                            data=reponse_financement,
-                            file_name=f"opportunites_financement_{datetime.now().strftime('%Y%m%d')}.txt",
-                            mime="text/plain",
-                            key="dl_financement_txt"
-                        )
-                    with col_word:
-                        st.download_button(
-                            label=tr('download_word'),
-                            data=make_docx(tr('doc_title_financement'), reponse_financement),
-                            file_name=f"opportunites_financement_{datetime.now().strftime('%Y%m%d')}.docx",
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            key="dl_financement_word"
-                        )
+                    afficher_telechargements(reponse_financement, "opportunites_financement", tr('doc_title_financement'), "dl_financement")
 
         # 🗓️ Plan d'action 90 jours
         st.markdown("### " + tr('plan_action_90_title'))
@@ -1681,47 +1970,35 @@ RESSOURCES SPÉCIFIQUES À MENTIONNER SI PERTINENTES :
             if st.button(tr('plan_action_90_generate'), use_container_width=True, key="plan_90"):
                 st.subheader(tr('plan_action_90_title'))
                 with st.spinner(tr('generating')):
-                    prompt = f"""{contexte}
-
-En tant que conseiller en entrepreneuriat au Sénégal, crée un plan d'action structuré sur 90 jours:
-- Semaines 1-4: Actions immédiates (marketing, opérations, finances)
-- Semaines 5-8: Consolidation (processus, équipe, partenariats)
-- Semaines 9-12: Évaluation et ajustement
-
-Inclure: objectifs mesurables, tâches concrètes, indicateurs de succès, et ressources locales pertinentes.
-"""
-                    reponse_plan = generate_recommendations_stream(prompt)
+                    reponse_plan = generate_recommendations_stream(*build_section_prompt("plan_90", profile))
                     st.session_state['plan_90_text'] = reponse_plan
         with col_plan2:
             if st.session_state.get('plan_90_text'):
                 encoded = urllib.parse.quote(st.session_state['plan_90_text'])
                 st.markdown(f"[{tr('share_whatsapp')}](https://wa.me/?text={encoded})")
-                st.download_button(
-                    label=tr('download_txt'),
-                    data=st.session_state['plan_90_text'],
-                    file_name=f"plan_90_jours_{datetime.now().strftime('%Y%m%d')}.txt",
-                    mime="text/plain",
-                    key="dl_plan90_txt"
+                plan_text = st.session_state['plan_90_text']
+                export_download_button(
+                    tr('download_txt'),
+                    content_key("txt", plan_text),
+                    lambda: plan_text,
+                    f"plan_90_jours_{datetime.now().strftime('%Y%m%d')}.txt",
+                    "text/plain",
+                    "dl_plan90_txt"
                 )
-                st.download_button(
-                    label=tr('download_word'),
-                    data=make_docx(tr('plan_action_90_title'), st.session_state['plan_90_text']),
-                    file_name=f"plan_90_jours_{datetime.now().strftime('%Y%m%d')}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    key="dl_plan90_docx"
+                export_download_button(
+                    tr('download_word'),
+                    content_key("docx", tr('plan_action_90_title'), plan_text),
+                    lambda: make_docx(tr('plan_action_90_title'), plan_text),
+                    f"plan_90_jours_{datetime.now().strftime('%Y%m%d')}.docx",
+                    DOCX_MIME,
+                    "dl_plan90_docx",
+                    lazy=True
                 )
 
         # 📚 Ressources Locales (Recherche)
         st.markdown("### " + tr('local_resources_title'))
         query = st.text_input(tr('search_resources_placeholder'), key="search_resources")
-        def match_res(r, q):
-            q = q.lower()
-            return (
-                q in r["name"].lower() or
-                any(q in t.lower() for t in r["tags"]) or
-                q in r["description"].lower()
-            )
-        filtered = LOCAL_RESOURCES if not query or not query.strip() else [r for r in LOCAL_RESOURCES if match_res(r, query.strip())]
+        filtered = get_resource_catalog().current().index.search(query or "", k=20)
         for r in filtered:
             link = f" [Lien]({r['link']})" if r.get('link') else ""
             tags = ", ".join(r["tags"]) if r.get("tags") else ""
@@ -1735,65 +2012,30 @@ Inclure: objectifs mesurables, tâches concrètes, indicateurs de succès, et re
         if st.button(tr('analyse_complete_button'), type="primary", use_container_width=True):
             st.subheader(tr('analyse_complete_button'))
             with st.spinner(tr('generating')):
-                prompt = f"""{contexte}
-
-En tant qu'expert en entrepreneuriat au Sénégal, fournis une analyse complète et des recommandations globales pour cet entrepreneur.
-
-Structure ton analyse ainsi:
-
-1. **ANALYSE DU PROFIL**
-   - Forces principales
-   - Faiblesses critiques
-   - Opportunités de développement
-
-2. **RECOMMANDATIONS PRIORITAIRES**
-   - Top 3 des compétences à développer en urgence
-   - Actions concrètes pour chaque compétence
-   - Délais recommandés
-
-3. **PLAN D'ACTION 90 JOURS**
-   - Semaines 1-4: Actions immédiates
-   - Semaines 5-8: Consolidation
-   - Semaines 9-12: Évaluation et ajustement
-
-4. **RESSOURCES SPÉCIFIQUES AU SÉNÉGAL**
-   - Organisations d'accompagnement
-   - Programmes de formation
-   - Réseaux d'entrepreneurs
-   - Opportunités de financement
-
-RESSOURCE PRIORITAIRE À MENTIONNER :
-- Daaray Jàmbaar Yi (CBAO Groupe Attijariwafa bank) : centre d'accompagnement complet offrant formations entrepreneuriales, coaching personnalisé, mentorat par professionnels bancaires, aide au montage de projets et business plans, facilitation d'accès au financement, et networking avec entrepreneurs et investisseurs. Idéal pour tous profils d'entrepreneurs (jeunes porteurs de projet, TPME, PME, femmes entrepreneures).
-
-RESSOURCES FORMATION À PRIVILÉGIER :
-- ONFP — Office National de Formation Professionnelle : programmes de formation professionnelle, certifications, apprentissage technique et reconversion, adaptés au développement des compétences métiers.
-NOTE FORMATION : ADEPME n’offre plus de formation ; ne pas la recommander pour ce volet.
-
-5. **CONSEILS ADAPTÉS AU SECTEUR** ({secteur})
-   - Spécificités du secteur au Sénégal
-   - Meilleures pratiques
-   - Pièges à éviter
-
-Sois concret, actionnable et adapté au contexte sénégalais."""
-                
-                reponse = generate_recommendations_stream(prompt)
+                reponse = generate_recommendations_stream(
+                    *build_section_prompt("analyse_complete", profile), priority=PRIORITY_REPORT
+                )
                 
                 # Option de téléchargement
-                st.download_button(
-                    label=tr('download_analysis_complete'),
-                    data=reponse,
-                    file_name=f"analyse_complete_{datetime.now().strftime('%Y%m%d')}.txt",
-                    mime="text/plain"
+                export_download_button(
+                    tr('download_analysis_complete'),
+                    content_key("txt", reponse),
+                    lambda: reponse,
+                    f"analyse_complete_{datetime.now().strftime('%Y%m%d')}.txt",
+                    "text/plain",
+                    "dl_analyse_txt"
                 )
-                st.download_button(
-                    label=tr('download_analysis_word'),
-                    data=make_docx(tr('doc_title_analyse_complete'), reponse),
-                    file_name=f"analyse_complete_{datetime.now().strftime('%Y%m%d')}.docx",
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                export_download_button(
+                    tr('download_analysis_word'),
+                    content_key("docx", tr('doc_title_analyse_complete'), reponse),
+                    lambda: make_docx(tr('doc_title_analyse_complete'), reponse),
+                    f"analyse_complete_{datetime.now().strftime('%Y%m%d')}.docx",
+                    DOCX_MIME,
+                    "dl_analyse_word"
                 )
 
 # Footer
-with tab4:
+if section_active == "adja":
     st.header("👩🏾‍💼 " + tr('tab_adja'))
     st.caption(tr('adja_caption'))
     if 'coaching_journal' not in st.session_state:
@@ -1829,35 +2071,21 @@ with tab4:
         st.success(tr('adja_profile_success'))
     else:
         st.info(tr('adja_info_prompt'))
-        if st.button(tr('goto_eval_button'), key="goto_eval_button"):
-            components.html("""
-            <script>
-            (function() {
-              const doc = window.parent.document;
-              const buttons = doc.querySelectorAll('button[role="tab"]');
-              if (buttons && buttons.length > 0) {
-                buttons[0].click();
-                return;
-              }
-              const divs = doc.querySelectorAll('div[role="tab"]');
-              if (divs && divs.length > 0) {
-                divs[0].click();
-              }
-            })();
-            </script>
-            """, height=0)
+        st.button(tr('goto_eval_button'), key="goto_eval_button", on_click=aller_a_section, args=("eval",))
 
     # Journal de coaching
     st.markdown("### " + tr('journal_coaching_title'))
     if st.session_state['coaching_journal']:
+        import pandas as pd  # import différé : seulement si le journal contient des entrées
         df_journal = pd.DataFrame(st.session_state['coaching_journal'])
         st.dataframe(df_journal, use_container_width=True, hide_index=True)
-        st.download_button(
-            label=tr('download_journal_csv'),
-            data=df_journal.to_csv(index=False),
-            file_name=f"journal_coaching_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            key="dl_journal_csv"
+        export_download_button(
+            tr('download_journal_csv'),
+            content_key("csv", *(tuple(entry.values()) for entry in st.session_state['coaching_journal'])),
+            lambda: df_journal.to_csv(index=False),
+            f"journal_coaching_{datetime.now().strftime('%Y%m%d')}.csv",
+            "text/csv",
+            "dl_journal_csv"
         )
     else:
         st.caption(tr('journal_empty_caption'))
@@ -1869,3 +2097,6 @@ st.markdown(f"""
     <p style='font-size: 0.8em'>{tr('footer_tool_sub')}</p>
 </div>
 """, unsafe_allow_html=True)
+
+# Sauvegarde différée de la session en fin d'exécution
+save_session()
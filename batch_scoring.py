@@ -0,0 +1,137 @@
+"""Calcul des scores par lots pour des fichiers de réponses (CSV ou Parquet).
+
+Chaque ligne du fichier d'entrée correspond à un répondant ; les 36 colonnes
+de réponses sont nommées comme les clés de l'application (``Leadership_0`` …
+``Gestion Financière_5``). Les valeurs hors de l'échelle 1-5 ou vides sont
+traitées comme des réponses absentes.
+
+Le fichier est lu et écrit par blocs : la mémoire reste constante quelle que
+soit la taille de l'entrée. Les calculs sont vectorisés avec NumPy.
+
+Exemples ::
+
+    python batch_scoring.py reponses.csv -o scores.csv
+    python batch_scoring.py cohorte.parquet -o scores.parquet --id-columns id,region
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from scoring import COMPETENCES, PROFILS, QUESTION_KEYS, question_key
+
+ITEM_COLUMNS = [question_key(competence, i) for competence, i in QUESTION_KEYS]
+
+# Début de chaque rubrique dans ITEM_COLUMNS (pour np.add.reduceat)
+_RUBRIC_OFFSETS = np.cumsum([0] + [len(d["questions"]) for d in COMPETENCES.values()])[:-1]
+
+# Seuils de profil par ordre croissant, pour np.searchsorted
+_SEUILS = np.array([p[0] for p in reversed(PROFILS)], dtype=float)
+_LIBELLES = np.array([p[1] for p in reversed(PROFILS)], dtype=object)
+_COULEURS = np.array([p[3] for p in reversed(PROFILS)], dtype=object)
+
+
+def score_frame(frame: pd.DataFrame, id_columns=()) -> pd.DataFrame:
+    """Scores par rubrique, moyenne et profil pour chaque ligne d'un bloc."""
+    values = frame[ITEM_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    answered = (values >= 1) & (values <= 5)
+    sums = np.add.reduceat(np.where(answered, values, 0.0), _RUBRIC_OFFSETS, axis=1)
+    counts = np.add.reduceat(answered.astype(np.int16), _RUBRIC_OFFSETS, axis=1)
+    # Même règle que compute_scores : 0.0 pour une rubrique sans réponse
+    means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    moyenne = means.sum(axis=1) / means.shape[1]
+    tier = np.searchsorted(_SEUILS, moyenne, side="right") - 1
+    tier = np.clip(tier, 0, len(_SEUILS) - 1)
+
+    result = frame[list(id_columns)].reset_index(drop=True) if id_columns else pd.DataFrame()
+    for column, competence in enumerate(COMPETENCES):
+        result[competence] = means[:, column]
+    result["moyenne"] = moyenne
+    result["profil"] = _LIBELLES[tier]
+    result["couleur"] = _COULEURS[tier]
+    result["reponses"] = counts.sum(axis=1)
+    return result
+
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def iter_chunks(path: str, chunksize: int, columns):
+    """Lit le fichier d'entrée par blocs de ``chunksize`` lignes."""
+    if _is_parquet(path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("La lecture Parquet nécessite pyarrow (pip install pyarrow).")
+        parquet = pq.ParquetFile(path)
+        missing = [c for c in columns if c not in parquet.schema_arrow.names]
+        if missing:
+            raise KeyError(missing)
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield batch.to_pandas()
+    else:
+        source = sys.stdin if path == "-" else path
+        wanted = set(columns)
+        reader = pd.read_csv(source, chunksize=chunksize, usecols=lambda c: c in wanted)
+        for chunk in reader:
+            missing = [c for c in columns if c not in chunk.columns]
+            if missing:
+                raise KeyError(missing)
+            yield chunk
+
+
+class _Writer:
+    """Écrit les blocs de résultats au fil de l'eau (CSV ou Parquet)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._parquet = None
+        self._first = True
+
+    def write(self, frame: pd.DataFrame):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            target = sys.stdout if self.path == "-" else self.path
+            frame.to_csv(target, mode="w" if self._first else "a", header=self._first,
+                         index=False, float_format="%.4f")
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Calcule les scores entrepreneuriaux d'un fichier de réponses.")
+    parser.add_argument("input", help="fichier CSV ou Parquet (ou - pour un CSV sur l'entrée standard)")
+    parser.add_argument("-o", "--output", default="-", help="fichier de sortie CSV ou Parquet (défaut : sortie standard)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="nombre de lignes par bloc")
+    parser.add_argument("--id-columns", default="", help="colonnes à recopier en sortie, séparées par des virgules")
+    args = parser.parse_args(argv)
+
+    id_columns = [c.strip() for c in args.id_columns.split(",") if c.strip()]
+    writer = _Writer(args.output)
+    rows = 0
+    try:
+        for chunk in iter_chunks(args.input, args.chunksize, id_columns + ITEM_COLUMNS):
+            writer.write(score_frame(chunk, id_columns))
+            rows += len(chunk)
+    except KeyError as e:
+        print(f"Colonnes manquantes dans {args.input} : {', '.join(e.args[0])}", file=sys.stderr)
+        return 2
+    finally:
+        writer.close()
+    print(f"{rows} répondants traités", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
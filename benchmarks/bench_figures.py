@@ -0,0 +1,84 @@
+"""Micro-benchmark de la construction des figures par réexécution.
+
+Une réexécution de l'onglet Résultats affiche deux radars (résumé et vue
+complète) et une heatmap. On compare le coût par réexécution :
+
+- sans cache : les trois figures sont reconstruites puis sérialisées ;
+- avec cache : les figures sont reprises du cache, seule la sérialisation
+  faite par ``st.plotly_chart`` reste.
+
+    python benchmarks/bench_figures.py [--reruns 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from functools import lru_cache
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plotly.io  # noqa: E402
+import plotly.tools  # noqa: E402
+
+from figures import build_heatmap, build_radar  # noqa: E402
+
+SCORES = (
+    ("Leadership", 3.5), ("Gestion & Délégation", 2.83), ("Créativité & Innovation", 4.0),
+    ("Réseautage & Relations", 3.17), ("Résilience & Persévérance", 3.33), ("Gestion Financière", 2.67),
+)
+
+
+def serialize(fig):
+    """Même conversion que st.plotly_chart avant l'envoi au navigateur."""
+    figure = plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True)
+    return plotly.io.to_json(figure, validate=False)
+
+
+def rerun_uncached():
+    serialize(build_radar(SCORES, "Vos Compétences", "Score"))
+    serialize(build_radar(SCORES, "Vos Compétences", "Score"))
+    serialize(build_heatmap(SCORES, "Score"))
+
+
+@lru_cache(maxsize=None)
+def cached_radar(scores, lang):
+    return build_radar(scores, "Vos Compétences", "Score")
+
+
+@lru_cache(maxsize=None)
+def cached_heatmap(scores, lang):
+    return build_heatmap(scores, "Score")
+
+
+def rerun_cached():
+    serialize(cached_radar(SCORES, "Français"))
+    serialize(cached_radar(SCORES, "Français"))
+    serialize(cached_heatmap(SCORES, "Français"))
+
+
+def measure(func, reruns):
+    func()  # échauffement (imports paresseux de plotly)
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=200)
+    args = parser.parse_args(argv)
+    med_u, p95_u = measure(rerun_uncached, args.reruns)
+    med_c, p95_c = measure(rerun_cached, args.reruns)
+    print(f"sans cache : médiane {med_u:6.2f} ms  p95 {p95_u:6.2f} ms par réexécution")
+    print(f"avec cache : médiane {med_c:6.2f} ms  p95 {p95_c:6.2f} ms par réexécution")
+    print(f"gain       : {med_u - med_c:6.2f} ms par réexécution ({med_u / med_c:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Coût CPU par réexécution selon la section affichée.
+
+Rejoue des parcours typiques avec l'outil de test de Streamlit et mesure le
+temps CPU de chaque réexécution du script (thread du script uniquement ; la
+compilation, que l'outil de test refait à chaque fois alors que le serveur la
+met en cache, est exclue) :
+
+- ``questionnaire`` : réponses aux 36 questions (section Évaluation) ;
+- ``resultats`` : modifications de l'âge dans la barre latérale pendant la
+  consultation de la section Résultats ;
+- ``coach`` : idem depuis la section Coach Fatouma.
+
+Avec ``--baseline REV``, la même mesure est faite sur la version du script à
+cette révision git (par exemple la version avec ``st.tabs``, où les quatre
+onglets s'exécutent à chaque fois) pour afficher le gain.
+
+    python benchmarks/bench_navigation.py [--baseline REV] [--edits 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "Profilage entrepeuneur.py")
+
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner import script_runner  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from scoring import COMPETENCES  # noqa: E402
+
+
+# Temps CPU de chaque exécution du script, mesuré dans son thread
+_EXECUTIONS = []
+_exec = script_runner.exec_func_with_error_handling
+
+
+def _timed_exec(func, ctx):
+    start = time.thread_time()
+    try:
+        return _exec(func, ctx)
+    finally:
+        _EXECUTIONS.append((time.thread_time() - start) * 1000)
+
+
+script_runner.exec_func_with_error_handling = _timed_exec
+
+
+def timed(samples, at):
+    """Exécute ``at`` ; une interaction peut entraîner plusieurs exécutions (st.rerun)."""
+    del _EXECUTIONS[:]
+    at.run()
+    samples.append(sum(_EXECUTIONS))
+    if at.exception:
+        raise SystemExit(str(at.exception))
+
+
+def show(at, section):
+    # Le script de référence (st.tabs) n'a pas de sélecteur : tout s'exécute
+    radios = [r for r in at.radio if r.key == "section_active"]
+    if radios:
+        radios[0].set_value(section)
+        at.run()
+
+
+def run_scenarios(app: str, edits: int) -> dict:
+    at = AppTest.from_file(app, default_timeout=120).run()
+    results = {"questionnaire": [], "resultats": [], "coach": []}
+    for ci, competence in enumerate(COMPETENCES):
+        at.button(key=f"rubrique_{competence}").click()
+        at.run()
+        for i in range(len(COMPETENCES[competence]["questions"])):
+            at.button(key=f"{competence}_{i}_btn_{(i + ci) % 5 + 1}").click()
+            timed(results["questionnaire"], at)
+    for scenario, section in (("resultats", "results"), ("coach", "adja")):
+        show(at, section)
+        for n in range(edits):
+            at.number_input[0].set_value(40 + n)
+            timed(results[scenario], at)
+    return results
+
+
+def baseline_script(rev: str) -> str:
+    source = subprocess.run(
+        ["git", "show", f"{rev}:Profilage entrepeuneur.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    handle = tempfile.NamedTemporaryFile("w", suffix=".py", delete=False, encoding="utf-8")
+    with handle:
+        handle.write(source)
+    return handle.name
+
+
+def report(label: str, results: dict) -> dict:
+    means = {}
+    for scenario, samples in results.items():
+        means[scenario] = statistics.mean(samples)
+        print(f"{label:<10} {scenario:<14} {len(samples):3d} interactions  "
+              f"moyenne {means[scenario]:6.1f} ms CPU  médiane {statistics.median(samples):6.1f} ms")
+    return means
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", help="révision git à comparer (ex. HEAD~1)")
+    parser.add_argument("--edits", type=int, default=10, help="modifications de la barre latérale par section")
+    args = parser.parse_args(argv)
+
+    run_scenarios(APP, 1)  # échauffement : imports paresseux et caches de processus
+    current = report("actuel", run_scenarios(APP, args.edits))
+    if args.baseline:
+        path = baseline_script(args.baseline)
+        try:
+            base = report(args.baseline, run_scenarios(path, args.edits))
+        finally:
+            os.unlink(path)
+        for scenario in current:
+            saved = base[scenario] - current[scenario]
+            print(f"gain {scenario:<14} {saved:7.1f} ms CPU par interaction ({base[scenario] / current[scenario]:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
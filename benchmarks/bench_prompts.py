@@ -0,0 +1,61 @@
+"""Coût de construction et taille des prompts de recommandations.
+
+Rend, pour un profil donné, les consignes et le contexte de chaque demande
+(sommaire, cinq sections, analyse complète) comme à chaque clic, puis
+affiche le temps de construction et la taille estimée en tokens de chaque
+modèle et de chaque partie commune du registre.
+
+    python benchmarks/bench_prompts.py [--runs 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_templates import REGISTRY, PromptProfile  # noqa: E402
+
+SECTIONS = ["sommaire", "formation", "strategie", "mentorat", "financement", "plan_90", "analyse_complete"]
+
+PROFILE = PromptProfile(
+    nom="Awa Diop", age="32", secteur="Artisanat", experience="3-5 ans", profil="Profil Intermédiaire",
+    moyenne=3.25, scores=(
+        ("Leadership", 3.5), ("Gestion & Délégation", 2.83), ("Créativité & Innovation", 4.0),
+        ("Réseautage & Relations", 3.17), ("Résilience & Persévérance", 3.33), ("Gestion Financière", 2.67),
+    ),
+)
+
+
+def build_all(profile):
+    return [(REGISTRY.render(section), REGISTRY.render("contexte", profile)) for section in SECTIONS]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    build_all(PROFILE)
+    samples = []
+    for n in range(args.runs):
+        # Un score différent à chaque fois : le contexte est réellement rendu
+        profile = PROFILE._replace(moyenne=PROFILE.moyenne + n * 1e-6)
+        start = time.perf_counter()
+        build_all(profile)
+        samples.append((time.perf_counter() - start) * 1e6)
+    print(f"7 demandes       : médiane {statistics.median(samples):7.1f} µs")
+
+    stats = REGISTRY.stats()
+    contexte = REGISTRY.render("contexte", PROFILE).tokens
+    for section in SECTIONS:
+        consignes = stats["templates"][section]["tokens"]
+        print(f"{section:<17}: consignes {consignes:4d} tokens (préfixe fixe) + contexte {contexte:3d} tokens")
+    for name, part in stats["parts"].items():
+        print(f"partie {name:<12}: {part['tokens']:4d} tokens, utilisée {part['uses']} fois")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Micro-benchmark de la construction du rapport Word avec l'image du radar.
+
+Chaque itération construit le rapport complet comme le bouton « Générer le
+rapport Word » : rendu PNG du radar (sans cache, pire cas) puis document
+Word avec ``doc.add_picture``. Le p95 est comparé à l'objectif.
+
+    python benchmarks/bench_report.py [--runs 50] [--target-ms 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from documents import make_rapport_docx  # noqa: E402
+from radar_png import render_radar_png  # noqa: E402
+
+SCORES = {
+    "Leadership": 3.5, "Gestion & Délégation": 2.83, "Créativité & Innovation": 4.0,
+    "Réseautage & Relations": 3.17, "Résilience & Persévérance": 3.33, "Gestion Financière": 2.67,
+}
+
+RAPPORT = {
+    "nom": "Awa Diop", "entreprise": "Awa Couture", "age": 32, "secteur": "Artisanat",
+    "experience": "3-5 ans", "profil": "Profil Intermédiaire",
+    "description": "Entrepreneur en développement avec un potentiel significatif",
+    "scores": SCORES,
+}
+
+RECO = "\n".join(f"{i}. Recommandation de démonstration." for i in range(1, 11))
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[max(0, int(len(ordered) * q) - 1)]
+
+
+def measure(func, runs):
+    func()  # échauffement (import de python-docx)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), percentile(samples, 0.95)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--target-ms", type=float, default=200.0)
+    args = parser.parse_args(argv)
+
+    scores_items = tuple(SCORES.items())
+    med_png, p95_png = measure(lambda: render_radar_png(scores_items), args.runs)
+    med, p95 = measure(lambda: make_rapport_docx(RAPPORT, RECO, render_radar_png(scores_items)), args.runs)
+    print(f"image radar   : médiane {med_png:6.2f} ms  p95 {p95_png:6.2f} ms")
+    print(f"rapport Word  : médiane {med:6.2f} ms  p95 {p95:6.2f} ms (objectif {args.target_ms:.0f} ms)")
+    if p95 > args.target_ms:
+        print("objectif dépassé", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Micro-benchmark de la recherche dans un catalogue de ressources.
+
+Construit un catalogue synthétique (par défaut 10 000 programmes, tirés de
+façon reproductible d'un vocabulaire du domaine) puis mesure la construction
+de l'index et la latence des requêtes typiques : mot exact, préfixe, sans
+accents, plusieurs mots. Le p95 des requêtes est comparé à l'objectif.
+
+    python benchmarks/bench_resource_search.py [--entries 10000] [--target-ms 1]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resource_index import ResourceIndex  # noqa: E402
+
+MOTS = (
+    "financement formation mentorat incubation accélération crédit microfinance subvention "
+    "agriculture élevage pêche artisanat commerce numérique textile transformation tourisme "
+    "jeunes femmes PME TPE coopérative export formalisation fiscalité comptabilité marketing "
+    "réseau diaspora région Dakar Thiès Saint-Louis Ziguinchor Kaolack Touba garantie leasing "
+    "innovation énergie solaire santé éducation logistique certification apprentissage emploi"
+).split()
+
+REQUETES = ["financement", "financ", "elevage", "femmes agriculture", "credit jeunes thies",
+            "numérique", "cooperative peche", "garantie pme", "zz"]
+
+
+def catalogue(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Programme {' '.join(rng.sample(MOTS, 2))} {i}",
+            "tags": rng.sample(MOTS, 4),
+            "description": " ".join(rng.choices(MOTS, k=18)),
+            "link": f"https://exemple.sn/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[max(0, int(len(ordered) * q) - 1)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--target-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    resources = catalogue(args.entries)
+    start = time.perf_counter()
+    index = ResourceIndex(resources)
+    print(f"construction  : {(time.perf_counter() - start) * 1000:7.1f} ms "
+          f"({len(index)} ressources, {len(index.vocabulary)} mots)")
+
+    worst = 0.0
+    for query in REQUETES:
+        index.search(query)
+        samples = []
+        for _ in range(args.runs):
+            t0 = time.perf_counter()
+            index.search(query)
+            samples.append((time.perf_counter() - t0) * 1000)
+        p95 = percentile(samples, 0.95)
+        worst = max(worst, p95)
+        print(f"{query:<22}: médiane {statistics.median(samples):6.3f} ms  p95 {p95:6.3f} ms")
+    print(f"pire p95      : {worst:6.3f} ms (objectif {args.target_ms:.1f} ms)")
+    return 0 if worst <= args.target_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Empreinte mémoire des réponses d'une session, avant et après compactage.
+
+Compare, pour un questionnaire complet, l'ancien stockage (36 clés
+``f"{rubrique}_{i}"`` dans ``st.session_state`` et copie du dictionnaire des
+scores) au stockage compact (``ScoreAggregate`` : un ``bytearray`` de 36
+octets et les agrégats par rubrique). Les tailles sont estimées avec
+``metrics.deep_sizeof`` et la taille sérialisée avec ``pickle``.
+
+    python benchmarks/bench_session_memory.py [--sessions 5000]
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import deep_sizeof  # noqa: E402
+from scoring import QUESTION_KEYS, ScoreAggregate, compute_scores, question_key  # noqa: E402
+
+
+def legacy_state(values) -> dict:
+    state = {question_key(c, i): v for (c, i), v in zip(QUESTION_KEYS, values)}
+    state["scores"] = compute_scores(state)
+    return state
+
+
+def compact_state(values) -> dict:
+    return {"score_aggregate": ScoreAggregate(list(values))}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000, help="sessions simultanées pour l'extrapolation")
+    args = parser.parse_args(argv)
+
+    values = [random.Random(0).randint(1, 5) for _ in QUESTION_KEYS]
+    for label, state in (("avant", legacy_state(values)), ("après", compact_state(values))):
+        size = deep_sizeof(state)
+        pickled = len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+        print(f"{label:<6} {len(state):3d} clés  {size:6d} octets en mémoire  {pickled:5d} octets sérialisés"
+              f"  ({size * args.sessions / 1024 / 1024:.1f} Mo pour {args.sessions} sessions)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Mesure du démarrage à froid de l'application (premier affichage).
+
+Le premier rendu est exécuté dans un sous-processus lancé avec
+``python -X importtime`` ; seuls les imports réalisés pendant ce rendu sont
+retenus (Streamlit et l'outil de test sont chargés avant). Le script affiche
+les modules les plus coûteux et échoue (code 1) si un module lourd réservé
+aux exports ou au chat est chargé au démarrage, ou si le budget est dépassé.
+
+    python benchmarks/bench_startup.py [--budget-ms 400] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "Profilage entrepeuneur.py")
+MARKER = "----premier-rendu----"
+
+# Modules qui ne doivent pas être chargés par le premier affichage
+LAZY_MODULES = ("docx", "pandas", "openai", "httpx", "plotly.express")
+
+CHILD = f"""
+import sys, time
+sys.path.insert(0, {ROOT!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({APP!r}, default_timeout=120)
+print({MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+at.run()
+print("wall_ms=%.1f" % ((time.perf_counter() - start) * 1000))
+if at.exception:
+    raise SystemExit(str(at.exception))
+"""
+
+
+def parse_importtime(stderr: str):
+    """Retourne [(module, cumul_us, self_us)] pour les imports après le marqueur."""
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        # Le nom garde son indentation, qui indique la profondeur d'import
+        name = fields[2][1:]
+        entries.append((name, int(fields[1]), int(fields[0])))
+    return entries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=400.0,
+                        help="temps cumulé maximal des imports du premier rendu")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:], file=sys.stderr)
+        return proc.returncode
+    entries = parse_importtime(proc.stderr)
+    # Modules de premier niveau (sans indentation) : leur cumul couvre tout le reste
+    top_level = [(n, c, s) for n, c, s in entries if not n.startswith(" ")]
+    total_ms = sum(c for _, c, _ in top_level) / 1000
+    print(proc.stdout.strip())
+    print(f"imports pendant le premier rendu : {total_ms:.1f} ms ({len(entries)} modules)")
+    for name, cumul, _ in sorted(top_level, key=lambda e: e[1], reverse=True)[:args.top]:
+        print(f"  {cumul / 1000:8.1f} ms  {name}")
+
+    loaded = {n.strip() for n, _, _ in entries}
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    status = 0
+    if eager:
+        print(f"ÉCHEC : modules chargés au démarrage alors qu'ils devraient être différés : {', '.join(eager)}")
+        status = 1
+    if total_ms > args.budget_ms:
+        print(f"ÉCHEC : {total_ms:.1f} ms > budget de {args.budget_ms:.0f} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
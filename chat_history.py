@@ -0,0 +1,80 @@
+"""Fenêtre glissante de l'historique du chat de Coach Fatouma.
+
+Les derniers échanges sont envoyés tels quels, dans la limite d'un nombre de
+tours et d'un budget de tokens. Les échanges plus anciens sont condensés dans
+un résumé cumulatif, régénéré uniquement quand de nouveaux messages sortent de
+la fenêtre.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimation rapide du nombre de tokens (environ 4 caractères par token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def count_message_tokens(messages) -> int:
+    """Tokens estimés d'une liste de messages, surcoût de formatage compris."""
+    return sum(estimate_tokens(m.get("content") or "") + 4 for m in messages)
+
+
+class ChatHistoryManager:
+    """Construit l'historique envoyé au modèle à partir de l'historique complet."""
+
+    def __init__(self, max_turns: int = 6, token_budget: int = 2000, summarize=None):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        # summarize(resume_precedent, nouveaux_messages) -> nouveau résumé
+        self.summarize = summarize
+
+    def split(self, history) -> int:
+        """Indice du premier message conservé tel quel dans la fenêtre."""
+        tokens = 0
+        turns = 0
+        start = len(history)
+        for index in range(len(history) - 1, -1, -1):
+            message = history[index]
+            cost = estimate_tokens(message.get("content") or "") + 4
+            is_last = index == len(history) - 1
+            if message["role"] == "user":
+                turns += 1
+            if not is_last and (turns > self.max_turns or tokens + cost > self.token_budget):
+                break
+            tokens += cost
+            start = index
+        # Si des messages sont écartés, la fenêtre commence par une question :
+        # une réponse isolée part dans le résumé
+        if start > 0:
+            while start < len(history) - 1 and history[start]["role"] != "user":
+                start += 1
+        return start
+
+    def build(self, history, state: dict):
+        """Retourne (messages à envoyer, détail des tokens).
+
+        ``state`` est un dictionnaire conservé entre les requêtes (clés
+        ``covered`` et ``text``) qui porte le résumé déjà calculé.
+        """
+        start = self.split(history)
+        older, window = history[:start], history[start:]
+        covered = state.get("covered", 0)
+        if len(older) > covered and self.summarize is not None:
+            try:
+                state["text"] = self.summarize(state.get("text", ""), older[covered:])
+                state["covered"] = len(older)
+            except Exception:
+                # Le résumé sera retenté à la prochaine requête
+                pass
+        messages = []
+        if state.get("text"):
+            messages.append({
+                "role": "system",
+                "content": "Résumé des échanges précédents avec l'utilisateur :\n" + state["text"],
+            })
+        messages += window
+        report = {
+            "summary_tokens": count_message_tokens(messages[:1]) if state.get("text") else 0,
+            "window_tokens": count_message_tokens(window),
+            "window_messages": len(window),
+            "summarized_messages": state.get("covered", 0),
+        }
+        return messages, report
@@ -0,0 +1,69 @@
+"""Construction des documents Word exportés, sans dépendance à Streamlit.
+
+``python-docx`` n'est importé qu'au premier export. Le rapport complet peut
+recevoir l'image PNG du radar (voir ``radar_png``) ; ses axes sont numérotés
+et une légende reprend les rubriques dans le même ordre.
+"""
+import io
+from datetime import datetime
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+# Fonction pour créer un document Word
+def make_docx(title: str, content: str) -> bytes:
+    from docx import Document  # import différé : seulement lors d'un export Word
+    buf = io.BytesIO()
+    doc = Document()
+    doc.add_heading(title, level=1)
+    doc.add_paragraph(datetime.now().strftime("%Y-%m-%d %H:%M"))
+    for line in content.splitlines():
+        doc.add_paragraph(line)
+    doc.save(buf)
+    buf.seek(0)
+    return buf.getvalue()
+
+
+# Rapport Word complet du profil
+def make_rapport_docx(rapport: dict, reco_text: str | None, radar_png: bytes | None = None) -> bytes:
+    from docx import Document
+    from docx.shared import Inches
+    buf = io.BytesIO()
+    
+    doc = Document()
+    doc.add_heading("Rapport de Profilage Entrepreneurial", level=1)
+    doc.add_paragraph(datetime.now().strftime("%Y-%m-%d %H:%M"))
+    
+    doc.add_heading("Informations", level=2)
+    doc.add_paragraph(f"Nom: {rapport['nom']}")
+    doc.add_paragraph(f"Entreprise: {rapport['entreprise']}")
+    doc.add_paragraph(f"Âge: {rapport['age']}")
+    doc.add_paragraph(f"Secteur: {rapport['secteur']}")
+    doc.add_paragraph(f"Expérience: {rapport['experience']}")
+    
+    doc.add_heading("Synthèse du Profil", level=2)
+    doc.add_paragraph(f"Profil: {rapport['profil']}")
+    doc.add_paragraph(rapport['description'])
+    
+    doc.add_heading("Scores par Compétence", level=2)
+    for comp, sc in rapport['scores'].items():
+        doc.add_paragraph(f"- {comp}: {sc:.2f}/5")
+    
+    doc.add_heading("Cartographie des Compétences", level=2)
+    if radar_png:
+        doc.add_picture(io.BytesIO(radar_png), width=Inches(4.5))
+        # Légende des axes numérotés du radar
+        for i, (comp, sc) in enumerate(rapport['scores'].items(), start=1):
+            doc.add_paragraph(f"{i}. {comp} ({sc:.2f}/5)")
+    else:
+        doc.add_paragraph("Consultez l'application pour visualiser le diagramme radar interactif.")
+    
+    # Inclure les recommandations sommaires seulement si générées
+    if reco_text and reco_text.strip():
+        doc.add_heading("Recommandations Sommaires", level=2)
+        for line in reco_text.splitlines():
+            doc.add_paragraph(line)
+    
+    doc.save(buf)
+    buf.seek(0)
+    return buf.getvalue()
@@ -0,0 +1,66 @@
+"""Cache des fichiers exportés (TXT, CSV, Word), indexé par empreinte du contenu.
+
+Un même contenu n'est converti qu'une fois : les réexécutions du script et
+les autres sessions réutilisent les mêmes octets. Le cache est borné en
+nombre d'entrées et en taille, les entrées les moins récemment utilisées
+étant supprimées en premier.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import metrics
+
+
+def content_key(fmt: str, *parts) -> str:
+    """Empreinte d'un export : format et éléments qui déterminent son contenu."""
+    digest = hashlib.sha256(fmt.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x1f")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ExportCache:
+    """Cache LRU en mémoire des octets exportés."""
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        return data
+
+    def get_or_build(self, key: str, build) -> bytes:
+        """Retourne les octets en cache, ou les construit avec ``build()``."""
+        data = self.get(key)
+        if data is not None:
+            metrics.incr("export_cache.hits")
+            return data
+        metrics.incr("export_cache.misses")
+        data = build()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._store(key, data)
+        return data
+
+    def _store(self, key: str, data: bytes) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size}
@@ -0,0 +1,64 @@
+"""Construction des graphiques Plotly de l'application.
+
+Les fonctions reçoivent les scores sous forme de tuple ``((rubrique, score), ...)``
+et les libellés déjà traduits : leurs arguments sont hachables, ce qui permet
+de mettre les figures en cache.
+"""
+import plotly.graph_objects as go
+
+
+def build_radar(scores_items: tuple, trace_name: str, score_label: str):
+    """Crée un beau diagramme radar avec Plotly"""
+    categories = [comp for comp, _ in scores_items]
+    valeurs = [score for _, score in scores_items]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatterpolar(
+        r=valeurs,
+        theta=categories,
+        fill='toself',
+        name=trace_name,
+        line=dict(color='rgba(102, 126, 234, 0.8)', width=1.5),
+        fillcolor='rgba(102, 126, 234, 0.35)',
+        hovertemplate=f'<b>%{{theta}}</b><br>{score_label}: %{{r:.2f}}/5<extra></extra>'
+    ))
+
+    # Supprime la ligne horizontale au milieu pour éviter de cacher des libellés
+    # fig.add_hline(y=3.0, line_dash="dash", line_color="gray", opacity=0.5)
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 5],
+                showline=False,
+                gridcolor='rgba(0,0,0,0.1)',
+                gridwidth=0.6,
+                tickfont=dict(size=11)
+            ),
+            angularaxis=dict(
+                rotation=90,
+                direction='clockwise',
+                tickfont=dict(size=14, color='#2c3e50')
+            )
+        ),
+        showlegend=True,
+        height=500,
+        font=dict(family="Arial, sans-serif", size=12),
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+
+def build_heatmap(scores_items: tuple, score_label: str):
+    """Heatmap des scores par compétence"""
+    heatmap_fig = go.Figure(data=go.Heatmap(
+        z=[[score for _, score in scores_items]],
+        x=[comp for comp, _ in scores_items],
+        y=[score_label],
+        colorscale='YlOrRd', zmin=0, zmax=5, showscale=True
+    ))
+    heatmap_fig.update_layout(height=180, margin=dict(l=10, r=10, t=10, b=10))
+    return heatmap_fig
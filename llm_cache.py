@@ -0,0 +1,119 @@
+"""Cache disque (SQLite) des réponses du modèle de langage.
+
+Les réponses sont indexées par une empreinte de la requête (messages, modèle,
+directive de langue, température). L'éviction combine une durée de vie (TTL),
+un nombre maximal d'entrées et une taille maximale, en supprimant d'abord les
+entrées les moins récemment utilisées (LRU).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def make_cache_key(messages, model: str, lang_directive: str, temperature: float) -> str:
+    """Calcule l'empreinte SHA-256 d'une requête de génération."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "lang": lang_directive,
+            "temperature": round(float(temperature), 3),
+            "messages": messages,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Cache persistant des réponses, partagé entre les sessions du processus."""
+
+    def __init__(self, directory: str, ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 500, max_bytes: int = 50 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "reponses.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reponses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reponses_access ON reponses(last_access)")
+
+    def get(self, key: str) -> str | None:
+        """Retourne la réponse en cache (et la marque comme récente), ou None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM reponses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM reponses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE reponses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Enregistre une réponse puis applique les limites d'éviction."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reponses (key, response, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM reponses WHERE created_at < ?", (now - self.ttl_seconds,))
+        # Les entrées sont classées de la plus récente à la plus ancienne : on garde
+        # celles qui tiennent dans le plafond d'entrées et de taille cumulée.
+        self._conn.execute(
+            "DELETE FROM reponses WHERE key IN ("
+            " SELECT key FROM ("
+            "  SELECT key,"
+            "   ROW_NUMBER() OVER (ORDER BY last_access DESC) AS rang,"
+            "   SUM(size) OVER (ORDER BY last_access DESC ROWS UNBOUNDED PRECEDING) AS cumul"
+            "  FROM reponses)"
+            " WHERE rang > ? OR cumul > ?)",
+            (self.max_entries, self.max_bytes),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM reponses")
+
+    def stats(self) -> dict:
+        """Compteurs de succès/échecs et occupation du cache."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reponses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
@@ -0,0 +1,128 @@
+"""Ordonnanceur des requêtes au modèle de langage, commun à toutes les sessions.
+
+Deux limites s'appliquent à l'ouverture d'une requête :
+
+- un nombre maximal de requêtes simultanées (flux ouverts) ;
+- un débit maximal (seau à jetons : ``rate`` requêtes par seconde, avec une
+  rafale de ``burst`` requêtes).
+
+Les requêtes en attente sont servies par priorité (``PRIORITY_CHAT`` avant
+``PRIORITY_RECO`` avant ``PRIORITY_REPORT``), puis par ordre d'arrivée. Un
+appelant peut suivre sa position dans la file ; le temps d'attente est
+mesuré (``llm.queue_wait_ms``).
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import namedtuple
+
+import metrics
+
+PRIORITY_CHAT = 0
+PRIORITY_RECO = 1
+PRIORITY_REPORT = 2
+
+# Position dans la file transmise aux threads d'affichage
+QueuePosition = namedtuple("QueuePosition", ["position"])
+
+
+class Slot:
+    """Place accordée par l'ordonnanceur ; à libérer en fin de requête."""
+
+    def __init__(self, scheduler):
+        self._scheduler = scheduler
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._scheduler._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class LLMScheduler:
+    """Limite de concurrence et de débit avec file d'attente par priorité."""
+
+    def __init__(self, max_concurrent: int = 8, rate: float = 5.0, burst: int = 10,
+                 clock=time.monotonic):
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.active = 0
+        self.granted = 0
+        self._tokens = float(burst)
+        self._refilled = clock()
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def acquire(self, priority: int = PRIORITY_RECO, on_position=None) -> Slot:
+        """Attend son tour puis retourne une place (``Slot``).
+
+        ``on_position(n)`` est appelé hors verrou quand la position dans la
+        file change (1 = prochaine requête servie).
+        """
+        ticket = (priority, next(self._seq))
+        start = self.clock()
+        shown = None
+        waited = False
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+        try:
+            while True:
+                with self._cond:
+                    self._refill(self.clock())
+                    if self._queue[0] == ticket and self.active < self.max_concurrent and self._tokens >= 1:
+                        heapq.heappop(self._queue)
+                        self._tokens -= 1
+                        self.active += 1
+                        self.granted += 1
+                        # La requête suivante peut peut-être partir aussi
+                        self._cond.notify_all()
+                        break
+                    position = 1 + sum(1 for other in self._queue if other < ticket)
+                    if on_position is None or position == shown:
+                        waited = True
+                        # Attente d'une libération, ou du prochain jeton
+                        self._cond.wait(0.5 if self._tokens >= 1 else (1 - self._tokens) / self.rate)
+                        continue
+                shown = position
+                on_position(position)
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                self._cond.notify_all()
+            raise
+        metrics.observe("llm.queue_wait_ms", (self.clock() - start) * 1000)
+        if waited:
+            metrics.incr("llm.queued_requests")
+        return Slot(self)
+
+    def _release(self) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill(self.clock())
+            return {
+                "active": self.active,
+                "queued": len(self._queue),
+                "granted": self.granted,
+                "tokens": round(self._tokens, 2),
+                "max_concurrent": self.max_concurrent,
+            }
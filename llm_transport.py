@@ -0,0 +1,109 @@
+"""Transport HTTP partagé par tous les clients du modèle de langage.
+
+Un seul pool de connexions ``httpx`` (keep-alive, limites, délais) est utilisé
+par le processus, quel que soit le nombre de sessions. Le transport compte les
+requêtes en cours, les attentes de connexion et les réponses 429/5xx pour le
+suivi ; les nouvelles tentatives avec attente exponentielle sont assurées par
+le client OpenAI (``max_retries``).
+"""
+import threading
+
+import httpx
+
+
+class _CountedStream(httpx.SyncByteStream):
+    """Flux de réponse qui signale sa fermeture au transport."""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class InstrumentedTransport(httpx.HTTPTransport):
+    """Transport httpx avec statistiques sur l'utilisation du pool."""
+
+    def __init__(self, limits: httpx.Limits, **kwargs):
+        super().__init__(limits=limits, **kwargs)
+        self.max_connections = limits.max_connections
+        self._lock = threading.Lock()
+        self.active = 0
+        self.requests = 0
+        self.waits = 0
+        self.throttled = 0
+        self.server_errors = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            # Toutes les connexions sont prises : la requête attend une place dans le pool
+            if self.max_connections is not None and self.active >= self.max_connections:
+                self.waits += 1
+            self.active += 1
+            self.requests += 1
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self._release()
+            raise
+        with self._lock:
+            if response.status_code == 429:
+                self.throttled += 1
+            elif response.status_code >= 500:
+                self.server_errors += 1
+        response.stream = _CountedStream(response.stream, self._release)
+        return response
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+
+    def stats(self) -> dict:
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for c in connections if c.is_idle())
+        with self._lock:
+            return {
+                "connections": len(connections),
+                "idle_connections": idle,
+                "active_requests": self.active,
+                "requests": self.requests,
+                "pool_waits": self.waits,
+                "responses_429": self.throttled,
+                "responses_5xx": self.server_errors,
+            }
+
+
+class PooledHttpClient(httpx.Client):
+    """Client httpx partagé (pool, keep-alive et délais) exposant ses statistiques."""
+
+    def __init__(self, max_connections: int = 20, max_keepalive: int = 10,
+                 keepalive_expiry: float = 30.0, connect_timeout: float = 5.0,
+                 read_timeout: float = 60.0, write_timeout: float = 10.0,
+                 pool_timeout: float = 10.0):
+        self.pool_transport = InstrumentedTransport(httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ))
+        super().__init__(
+            transport=self.pool_transport,
+            timeout=httpx.Timeout(
+                connect=connect_timeout,
+                read=read_timeout,
+                write=write_timeout,
+                pool=pool_timeout,
+            ),
+        )
+
+    def stats(self) -> dict:
+        return self.pool_transport.stats()
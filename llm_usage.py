@@ -0,0 +1,44 @@
+"""Tokens consommés par requête, tels que rapportés par l'API.
+
+DeepSeek met en cache le début des prompts : les tokens d'un préfixe déjà
+vu (``prompt_cache_hit_tokens``) sont moins chers et plus rapides que les
+autres (``prompt_cache_miss_tokens``). Chaque appel est mesuré (compteurs et
+taux de succès du cache) et journalisé sur le logger ``djambar.llm``.
+Les API compatibles OpenAI rapportent le même chiffre dans
+``prompt_tokens_details.cached_tokens``. Un flux lu jusqu'au bout sans
+fragment d'usage est compté (``llm.usage.missing.<type>``) et signalé.
+"""
+import logging
+
+import metrics
+
+log = logging.getLogger("djambar.llm")
+
+
+def cache_hit_tokens(usage) -> int:
+    hit = getattr(usage, "prompt_cache_hit_tokens", None)
+    if hit is None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        hit = getattr(details, "cached_tokens", None) if details is not None else None
+    return int(hit or 0)
+
+
+def record_usage(kind: str, usage) -> None:
+    """Enregistre l'objet ``usage`` d'une réponse (ignoré s'il est absent)."""
+    if usage is None:
+        return
+    prompt = int(getattr(usage, "prompt_tokens", 0) or 0)
+    completion = int(getattr(usage, "completion_tokens", 0) or 0)
+    hit = cache_hit_tokens(usage)
+    metrics.incr("llm.usage.prompt_tokens", prompt)
+    metrics.incr("llm.usage.completion_tokens", completion)
+    metrics.incr("llm.usage.prompt_cache_hit_tokens", hit)
+    if prompt:
+        metrics.observe(f"llm.usage.prompt_cache_hit_rate.{kind}", hit / prompt)
+    log.info("llm %s prompt=%d cache_hit=%d completion=%d", kind, prompt, hit, completion)
+
+
+def record_missing_usage(kind: str) -> None:
+    """Flux terminé sans fragment d'usage (``include_usage`` ignoré ou perdu en route)."""
+    metrics.incr(f"llm.usage.missing.{kind}")
+    log.warning("llm %s : flux terminé sans usage", kind)
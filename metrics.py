@@ -0,0 +1,73 @@
+"""Métriques techniques partagées par toutes les sessions du processus.
+
+Deux types de mesures : des compteurs (``incr``) et des séries de valeurs
+observées (``observe``) résumées par leur nombre, total, dernière et plus
+grande valeur. ``deep_sizeof`` estime la mémoire occupée par un objet et
+son contenu (utilisé pour le rapport mémoire des sessions).
+"""
+import sys
+import threading
+
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_series: dict[str, dict] = {}
+
+
+def incr(name: str, value: float = 1) -> None:
+    """Incrémente un compteur."""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: float) -> None:
+    """Enregistre une valeur observée (durée, taille, nombre par requête...)."""
+    with _lock:
+        serie = _series.get(name)
+        if serie is None:
+            serie = _series[name] = {"count": 0, "total": 0.0, "last": 0.0, "max": 0.0}
+        serie["count"] += 1
+        serie["total"] += value
+        serie["last"] = value
+        serie["max"] = max(serie["max"], value)
+
+
+def mean(name: str, default: float = 0.0) -> float:
+    """Moyenne d'une série observée, ou ``default`` si elle est vide."""
+    with _lock:
+        serie = _series.get(name)
+        return serie["total"] / serie["count"] if serie else default
+
+
+def snapshot() -> dict:
+    """Copie de toutes les mesures, avec la moyenne de chaque série."""
+    with _lock:
+        result = dict(_counters)
+        for name, serie in _series.items():
+            result[name] = dict(serie, mean=round(serie["total"] / serie["count"], 3))
+    return result
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _series.clear()
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Taille en octets d'un objet et de ce qu'il contient (conteneurs et __slots__)."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    else:
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                size += deep_sizeof(getattr(obj, slot), seen)
+        if hasattr(obj, "__dict__"):
+            size += deep_sizeof(vars(obj), seen)
+    return size
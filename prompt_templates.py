@@ -0,0 +1,228 @@
+"""Registre des modèles de prompts des recommandations.
+
+Chaque modèle est compilé une seule fois, à l'import du module :
+
+- les parties communes (``[[nom]]``) sont remplacées par leur texte, défini
+  une seule fois dans le registre ;
+- les champs (``{nom}``) sont relevés et vérifiés ; un modèle sans champ
+  (consignes d'une section) est un texte constant, identique pour tous les
+  utilisateurs, ce qui en fait un bon préfixe pour le cache du fournisseur ;
+- la taille du texte fixe est estimée en tokens.
+
+Les modèles à champs sont rendus à partir d'un ``PromptProfile``. Chaque
+rendu retourne son texte et son nombre de tokens estimé (mesure
+``prompt.tokens.<modèle>``) ; ``stats()`` détaille la taille de chaque
+modèle et de chaque partie commune.
+"""
+import functools
+import re
+import string
+from collections import namedtuple
+
+import metrics
+from chat_history import estimate_tokens
+
+# Profil de l'entrepreneur utilisé par les prompts :
+# nom (str), age (str), secteur (str), experience (str), profil (str),
+# moyenne (float), scores (tuple de paires (compétence, score))
+PromptProfile = namedtuple("PromptProfile", ["nom", "age", "secteur", "experience", "profil", "moyenne", "scores"])
+
+# Texte rendu et nombre de tokens estimé
+Rendered = namedtuple("Rendered", ["text", "tokens"])
+
+_PART = re.compile(r"\[\[(\w+)\]\]")
+
+
+@functools.lru_cache(maxsize=256)
+def _values(profile: PromptProfile) -> dict:
+    """Champs disponibles pour un profil (calculés une fois par profil)."""
+    values = profile._asdict()
+    values["lignes_scores"] = "\n".join(f"- {comp}: {score:.2f}/5" for comp, score in profile.scores)
+    return values
+
+
+FIELDS = frozenset(PromptProfile._fields) | {"lignes_scores"}
+
+
+class PromptTemplate:
+    """Modèle compilé : parties communes résolues, champs relevés."""
+
+    def __init__(self, name: str, text: str, parts: dict):
+        self.name = name
+        self.parts_used = tuple(dict.fromkeys(_PART.findall(text)))
+        missing = [part for part in self.parts_used if part not in parts]
+        if missing:
+            raise KeyError(f"Partie inconnue dans le modèle {name} : {', '.join(missing)}")
+        self.text = _PART.sub(lambda m: parts[m.group(1)], text).strip()
+        self.fields = tuple(dict.fromkeys(
+            field.split(".")[0].split("[")[0]
+            for _, field, _, _ in string.Formatter().parse(self.text) if field
+        ))
+        unknown = set(self.fields) - FIELDS
+        if unknown:
+            raise KeyError(f"Champ inconnu dans le modèle {name} : {', '.join(sorted(unknown))}")
+        # Sans champ, le rendu est le texte lui-même
+        self.static = None if self.fields else Rendered(self.text, estimate_tokens(self.text))
+        self.renders = 0
+
+    def render(self, profile: PromptProfile | None = None) -> Rendered:
+        self.renders += 1
+        if self.static is not None:
+            return self.static
+        if profile is None:
+            raise ValueError(f"Le modèle {self.name} a besoin d'un profil (champs : {', '.join(self.fields)})")
+        text = self.text.format_map(_values(profile))
+        rendered = Rendered(text, estimate_tokens(text))
+        metrics.observe(f"prompt.tokens.{self.name}", rendered.tokens)
+        return rendered
+
+
+class PromptRegistry:
+    """Parties communes et modèles compilés, indexés par nom."""
+
+    def __init__(self):
+        self.parts: dict[str, str] = {}
+        self.templates: dict[str, PromptTemplate] = {}
+
+    def part(self, name: str, text: str) -> None:
+        self.parts[name] = text.strip()
+
+    def register(self, name: str, text: str) -> PromptTemplate:
+        template = self.templates[name] = PromptTemplate(name, text, self.parts)
+        return template
+
+    def render(self, name: str, profile: PromptProfile | None = None) -> Rendered:
+        return self.templates[name].render(profile)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.templates
+
+    def stats(self) -> dict:
+        """Taille (tokens du texte fixe) et nombre de rendus par modèle, taille et usages par partie."""
+        uses = {part: 0 for part in self.parts}
+        for template in self.templates.values():
+            for part in template.parts_used:
+                uses[part] += 1
+        return {
+            "templates": {
+                name: {"tokens": estimate_tokens(t.text), "fields": list(t.fields), "renders": t.renders}
+                for name, t in self.templates.items()
+            },
+            "parts": {
+                name: {"tokens": estimate_tokens(text), "uses": uses[name]}
+                for name, text in self.parts.items()
+            },
+        }
+
+
+RECO_PERSONA = "Tu es un expert en entrepreneuriat et en développement des compétences entrepreneuriales au Sénégal. Tu fournis des analyses précises et des recommandations personnalisées."
+
+REGISTRY = PromptRegistry()
+
+# Parties communes à plusieurs modèles
+REGISTRY.part("ton", "Sois concret, actionnable et adapté au contexte sénégalais.")
+
+# Données de l'entrepreneur, envoyées après les consignes
+REGISTRY.register("contexte", """
+Contexte de l'entrepreneur:
+- Nom: {nom}
+- Âge: {age}
+- Secteur: {secteur}
+- Expérience: {experience}
+- Profil identifié: {profil}
+- Score global moyen: {moyenne:.2f}/5
+
+Scores par compétence:
+{lignes_scores}
+""")
+
+# Consignes des demandes de recommandations : texte fixe, sans donnée de l'utilisateur,
+# pour rester un préfixe identique d'une requête à l'autre. Le persona (RECO_PERSONA)
+# précise déjà le domaine et le pays : les consignes ne le répètent pas.
+REGISTRY.register("sommaire", """
+Fournis 3-4 recommandations courtes et concrètes (maximum 150 mots) pour cet entrepreneur basées sur son profil.
+
+Focus sur:
+1. Les 2 compétences les plus faibles à améliorer en priorité
+2. Une action concrète à mettre en place dans les 30 prochains jours
+3. Une ressource ou contact utile au Sénégal
+
+[[ton]]
+""")
+REGISTRY.register("formation", """
+Propose un plan de formation détaillé et personnalisé pour cet entrepreneur.
+Inclus:
+1. Les domaines prioritaires à développer
+2. Des formations spécifiques recommandées (disponibles au Sénégal)
+3. Un calendrier suggéré sur 6-12 mois
+4. Des ressources locales (organisations, programmes, institutions sénégalaises)
+ADEPME n'offre plus de formation ; ne la recommande pas pour ce volet.
+""")
+REGISTRY.register("strategie", """
+Propose une stratégie de développement sur mesure pour cet entrepreneur.
+Inclus:
+1. Des objectifs SMART à court terme (3 mois)
+2. Des objectifs à moyen terme (6-12 mois)
+3. Des actions concrètes et mesurables
+4. Des indicateurs de succès
+5. Des opportunités spécifiques au contexte sénégalais
+""")
+REGISTRY.register("mentorat", """
+Recommande un programme de mentorat adapté à cet entrepreneur.
+Inclus:
+1. Le type de mentor idéal (profil, expérience)
+2. Les domaines où le mentorat est le plus nécessaire
+3. Des programmes de mentorat disponibles au Sénégal
+4. Comment tirer le meilleur parti du mentorat
+5. Des structures d'accompagnement locales (incubateurs, accélérateurs)
+""")
+REGISTRY.register("financement", """
+Identifie les opportunités de financement adaptées à cet entrepreneur.
+Inclus:
+1. Les types de financement recommandés selon son profil
+2. Des programmes de financement disponibles au Sénégal
+3. Les critères d'éligibilité typiques
+4. Comment renforcer sa candidature
+5. Des alternatives au financement traditionnel
+""")
+REGISTRY.register("plan_90", """
+Crée un plan d'action structuré sur 90 jours:
+- Semaines 1-4: Actions immédiates (marketing, opérations, finances)
+- Semaines 5-8: Consolidation (processus, équipe, partenariats)
+- Semaines 9-12: Évaluation et ajustement
+
+Inclure: objectifs mesurables, tâches concrètes, indicateurs de succès, et ressources locales pertinentes.
+""")
+REGISTRY.register("analyse_complete", """
+Fournis une analyse complète et des recommandations globales pour cet entrepreneur.
+
+Structure ton analyse ainsi:
+
+1. **ANALYSE DU PROFIL**
+   - Forces principales
+   - Faiblesses critiques
+   - Opportunités de développement
+
+2. **RECOMMANDATIONS PRIORITAIRES**
+   - Top 3 des compétences à développer en urgence
+   - Actions concrètes pour chaque compétence
+   - Délais recommandés
+
+3. **PLAN D'ACTION 90 JOURS**
+   - Semaines 1-4: Actions immédiates
+   - Semaines 5-8: Consolidation
+   - Semaines 9-12: Évaluation et ajustement
+
+4. **RESSOURCES SPÉCIFIQUES AU SÉNÉGAL**
+   - Organisations d'accompagnement
+   - Programmes de formation
+   - Réseaux d'entrepreneurs
+   - Opportunités de financement
+
+5. **CONSEILS ADAPTÉS AU SECTEUR** (celui de l'entrepreneur)
+   - Spécificités du secteur au Sénégal
+   - Meilleures pratiques
+   - Pièges à éviter
+
+[[ton]]
+""")
@@ -0,0 +1,142 @@
+"""Rendu du diagramme radar en image PNG, en Python pur.
+
+Utilisé pour le rapport Word : pas de navigateur ni de moteur de rendu
+externe, seulement ``zlib`` pour l'encodage PNG. Le polygone des scores est
+rempli ligne par ligne puis la grille, les axes et le contour sont tracés
+par-dessus. Chaque axe porte son numéro (1 à N), repris dans la légende du
+rapport.
+"""
+import math
+import struct
+import zlib
+
+BLANC = (255, 255, 255)
+GRILLE = (210, 210, 210)
+AXE = (170, 170, 170)
+REMPLISSAGE = (200, 208, 248)  # rgba(102, 126, 234, 0.35) sur fond blanc
+CONTOUR = (102, 126, 234)
+TEXTE = (44, 62, 80)
+
+# Chiffres 3x5 pour numéroter les axes
+_CHIFFRES = {
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"),
+    "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"),
+    "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"),
+    "7": ("111", "001", "010", "010", "010"),
+    "8": ("111", "101", "111", "101", "111"),
+    "9": ("111", "101", "111", "001", "111"),
+}
+
+
+class _Canvas:
+    def __init__(self, width: int, height: int, fond=BLANC):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(fond) * (width * height))
+
+    def point(self, x: int, y: int, couleur) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = (y * self.width + x) * 3
+            self.pixels[i:i + 3] = bytes(couleur)
+
+    def ligne(self, x0: float, y0: float, x1: float, y1: float, couleur, epaisseur: int = 1) -> None:
+        x0, y0, x1, y1 = round(x0), round(y0), round(x1), round(y1)
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+        err = dx + dy
+        demi = epaisseur // 2
+        while True:
+            for ox in range(-demi, epaisseur - demi):
+                for oy in range(-demi, epaisseur - demi):
+                    self.point(x0 + ox, y0 + oy, couleur)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def polygone(self, points, couleur, epaisseur: int = 1) -> None:
+        for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+            self.ligne(x0, y0, x1, y1, couleur, epaisseur)
+
+    def remplir(self, points, couleur) -> None:
+        """Remplissage par balayage horizontal (règle pair-impair)."""
+        ys = [y for _, y in points]
+        ligne_couleur = bytes(couleur)
+        for y in range(max(0, math.ceil(min(ys))), min(self.height, math.floor(max(ys)) + 1)):
+            centre = y + 0.5
+            xs = []
+            for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+                if (y0 <= centre < y1) or (y1 <= centre < y0):
+                    xs.append(x0 + (centre - y0) * (x1 - x0) / (y1 - y0))
+            xs.sort()
+            for debut, fin in zip(xs[::2], xs[1::2]):
+                a = max(0, round(debut))
+                b = min(self.width, round(fin))
+                if b > a:
+                    i = (y * self.width + a) * 3
+                    self.pixels[i:i + (b - a) * 3] = ligne_couleur * (b - a)
+
+    def texte(self, x: int, y: int, chaine: str, couleur, echelle: int = 3) -> None:
+        for n, caractere in enumerate(chaine):
+            motif = _CHIFFRES.get(caractere)
+            if motif is None:
+                continue
+            for ligne, bits in enumerate(motif):
+                for colonne, bit in enumerate(bits):
+                    if bit == "1":
+                        for ox in range(echelle):
+                            for oy in range(echelle):
+                                self.point(x + (n * 4 + colonne) * echelle + ox, y + ligne * echelle + oy, couleur)
+
+    def png(self) -> bytes:
+        ligne = self.width * 3
+        brut = b"".join(
+            b"\x00" + bytes(self.pixels[y * ligne:(y + 1) * ligne]) for y in range(self.height)
+        )
+
+        def bloc(type_: bytes, donnees: bytes) -> bytes:
+            return (struct.pack(">I", len(donnees)) + type_ + donnees
+                    + struct.pack(">I", zlib.crc32(type_ + donnees) & 0xFFFFFFFF))
+
+        entete = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + bloc(b"IHDR", entete)
+                + bloc(b"IDAT", zlib.compress(brut, 6)) + bloc(b"IEND", b""))
+
+
+def render_radar_png(scores_items: tuple, size: int = 480, max_score: float = 5.0) -> bytes:
+    """Dessine le radar des scores ``((rubrique, score), ...)`` et retourne un PNG."""
+    n = len(scores_items)
+    canvas = _Canvas(size, size)
+    cx = cy = size / 2
+    rayon = size * 0.38
+
+    def sommet(index: int, valeur: float):
+        # Premier axe en haut, sens horaire (comme le radar Plotly)
+        angle = -math.pi / 2 + 2 * math.pi * index / n
+        r = rayon * max(0.0, min(valeur, max_score)) / max_score
+        return (cx + r * math.cos(angle), cy + r * math.sin(angle))
+
+    donnees = [sommet(i, score) for i, (_, score) in enumerate(scores_items)]
+    if any(score > 0 for _, score in scores_items):
+        canvas.remplir(donnees, REMPLISSAGE)
+    for niveau in range(1, int(max_score) + 1):
+        canvas.polygone([sommet(i, niveau) for i in range(n)], GRILLE)
+    for i in range(n):
+        canvas.ligne(cx, cy, *sommet(i, max_score), AXE)
+    canvas.polygone(donnees, CONTOUR, epaisseur=3)
+    for x, y in donnees:
+        canvas.remplir([(x - 4, y - 4), (x + 4, y - 4), (x + 4, y + 4), (x - 4, y + 4)], CONTOUR)
+    for i in range(n):
+        x, y = sommet(i, max_score * 1.14)
+        numero = str(i + 1)
+        canvas.texte(round(x - len(numero) * 6), round(y - 7), numero, TEXTE)
+    return canvas.png()
@@ -0,0 +1,204 @@
+"""Catalogue des ressources locales chargé depuis un fichier JSON ou CSV.
+
+Le catalogue et son index de recherche sont construits une fois et partagés
+par toutes les sessions du processus. Un thread surveille le fichier : à
+chaque modification, le nouveau catalogue est validé et indexé en arrière-plan
+puis remplace l'ancien d'un seul coup. Les sessions en cours continuent
+d'utiliser la version qu'elles ont obtenue ; un fichier invalide est ignoré
+et la version précédente reste en service. Un fichier invalide au démarrage
+est remplacé par le catalogue de secours (ou un catalogue vide) jusqu'à sa
+correction.
+
+Formats acceptés :
+
+- JSON : une liste de ressources, ou ``{"resources": [...]}`` ;
+- CSV : colonnes ``name``, ``tags`` (séparés par ``;``), ``description``,
+  ``link``, ``boost`` et ``exclude_sections`` (séparées par ``;``), ces
+  trois dernières facultatives.
+
+Chaque ressource a un ``name`` et une ``description`` non vides, des ``tags``
+(liste de textes) et éventuellement :
+
+- un ``link`` http(s) ;
+- un ``boost`` (nombre positif, 1 par défaut) qui la favorise dans les prompts ;
+- des ``exclude_sections`` : sections de recommandations où elle n'est jamais
+  proposée (par exemple ``["formation"]`` pour un organisme qui ne forme plus).
+"""
+import csv
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+import metrics
+from resource_index import ResourceIndex
+
+# Version du catalogue en service : ressources, index et date de chargement
+Catalog = namedtuple("Catalog", ["resources", "index", "version", "loaded_at"])
+
+
+class CatalogError(ValueError):
+    """Fichier de catalogue illisible ou non conforme au schéma."""
+
+
+def validate_resource(entry, position: str) -> dict:
+    if not isinstance(entry, dict):
+        raise CatalogError(f"{position} : objet attendu")
+    resource = {}
+    for field in ("name", "description"):
+        value = entry.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise CatalogError(f"{position} : champ « {field} » obligatoire")
+        resource[field] = value.strip()
+    for field in ("tags", "exclude_sections"):
+        values = entry.get(field) or []
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise CatalogError(f"{position} : « {field} » doit être une liste de textes")
+        values = [value.strip() for value in values if value.strip()]
+        if field == "tags" or values:
+            resource[field] = values
+    link = entry.get("link") or ""
+    if not isinstance(link, str) or (link and not link.startswith(("http://", "https://"))):
+        raise CatalogError(f"{position} : « link » doit être une adresse http(s)")
+    if link:
+        resource["link"] = link
+    boost = entry.get("boost", 1.0)
+    if isinstance(boost, str):
+        try:
+            boost = float(boost) if boost.strip() else 1.0
+        except ValueError:
+            raise CatalogError(f"{position} : « boost » doit être un nombre positif")
+    if isinstance(boost, bool) or not isinstance(boost, (int, float)) or boost <= 0:
+        raise CatalogError(f"{position} : « boost » doit être un nombre positif")
+    if boost != 1.0:
+        resource["boost"] = float(boost)
+    return resource
+
+
+def _read_json(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise CatalogError(f"JSON invalide : {e}") from e
+    if isinstance(data, dict):
+        data = data.get("resources")
+    if not isinstance(data, list):
+        raise CatalogError("liste de ressources attendue")
+    return [validate_resource(entry, f"ressource {n}") for n, entry in enumerate(data, 1)]
+
+
+def _read_csv(path: str) -> list:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = {"name", "description"} - set(reader.fieldnames or ())
+        if missing:
+            raise CatalogError(f"colonnes manquantes : {', '.join(sorted(missing))}")
+        resources = []
+        for row in reader:
+            entry = dict(row, **{
+                field: (row.get(field) or "").split(";") for field in ("tags", "exclude_sections")
+            })
+            # La ligne 1 est l'en-tête
+            resources.append(validate_resource(entry, f"ligne {reader.line_num}"))
+    return resources
+
+
+def load_catalog(path: str) -> list:
+    """Lit et valide le catalogue ; lève ``CatalogError`` s'il n'est pas conforme."""
+    try:
+        if path.lower().endswith(".csv"):
+            resources = _read_csv(path)
+        else:
+            resources = _read_json(path)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Fichier enregistré en Latin-1 (Excel) ou CSV mal formé
+        raise CatalogError(f"fichier illisible : {e}") from e
+    if not resources:
+        raise CatalogError("catalogue vide")
+    return resources
+
+
+class CatalogStore:
+    """Catalogue partagé, rechargé en arrière-plan quand le fichier change."""
+
+    def __init__(self, path: str, poll_interval: float = 5.0, fallback: str | None = None):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.reloads = 0
+        self.last_error: str | None = None
+        self._signature = self._stat()
+        try:
+            resources = load_catalog(path)
+        except (OSError, CatalogError) as e:
+            # L'application démarre quand même ; le fichier corrigé est repris par la surveillance
+            self.last_error = str(e)
+            metrics.incr("catalog.reload_errors")
+            resources = self._fallback(fallback)
+        self._catalog = self._build(resources, version=1)
+        if poll_interval > 0:
+            threading.Thread(target=self._watch, name="catalog-watcher", daemon=True).start()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _fallback(path: str | None) -> list:
+        """Catalogue de secours, vide s'il est absent ou lui aussi invalide."""
+        if path:
+            try:
+                return load_catalog(path)
+            except (OSError, CatalogError):
+                pass
+        return []
+
+    @staticmethod
+    def _build(resources: list, version: int) -> Catalog:
+        return Catalog(tuple(resources), ResourceIndex(resources), version, time.time())
+
+    def current(self) -> Catalog:
+        """Version en service (une seule lecture d'attribut, sans verrou)."""
+        return self._catalog
+
+    def reload(self) -> bool:
+        """Recharge le fichier ; en cas d'erreur, la version en service est conservée."""
+        start = time.perf_counter()
+        try:
+            catalog = self._build(load_catalog(self.path), self._catalog.version + 1)
+        except (OSError, CatalogError) as e:
+            self.last_error = str(e)
+            metrics.incr("catalog.reload_errors")
+            return False
+        self._catalog = catalog
+        self.reloads += 1
+        self.last_error = None
+        metrics.observe("catalog.reload_ms", (time.perf_counter() - start) * 1000)
+        return True
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                signature = self._stat()
+                if signature is not None and signature != self._signature:
+                    self._signature = signature
+                    self.reload()
+            except Exception as e:
+                # Une erreur imprévue ne doit pas arrêter la surveillance
+                self.last_error = str(e)
+                metrics.incr("catalog.watch_errors")
+
+    def stats(self) -> dict:
+        catalog = self._catalog
+        return {
+            "path": self.path,
+            "resources": len(catalog.resources),
+            "version": catalog.version,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+        }
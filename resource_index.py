@@ -0,0 +1,151 @@
+"""Recherche dans le référentiel des ressources locales.
+
+Index inversé construit une fois par processus :
+
+- les textes sont normalisés sans accents ni majuscules (« eleve » trouve
+  « élevé ») puis découpés en mots, sans les mots vides ;
+- le nom, les tags et la description ont des poids différents ;
+- le poids BM25 de chaque couple (mot, ressource) est calculé à la
+  construction, une requête ne fait donc que des additions ; pour chaque
+  mot, les ressources sont aussi prétriées par poids, ce qui sert
+  directement les requêtes d'un seul mot ;
+- chaque mot de la requête peut être le début d'un mot indexé
+  (« financ » trouve « financement ») ; tous les mots de la requête
+  doivent être trouvés.
+"""
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+
+# Poids des champs dans la fréquence des termes
+FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "description": 1.0}
+# Une correspondance par préfixe compte un peu moins qu'un mot exact
+PREFIX_FACTOR = 0.8
+# Nombre maximal de mots indexés retenus pour un préfixe
+MAX_PREFIX_TERMS = 64
+
+STOPWORDS = frozenset(
+    "a au aux avec ce ces d dans de des du en et l la le les ou par pour sa se ses sur un une".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Minuscules sans accents."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return [w for w in _WORD.findall(fold(text)) if w not in STOPWORDS]
+
+
+def _fields(resource: dict) -> dict:
+    return {
+        "name": resource.get("name", ""),
+        "tags": " ".join(resource.get("tags") or ()),
+        "description": resource.get("description", ""),
+    }
+
+
+class ResourceIndex:
+    """Index inversé pondéré (BM25) d'une liste de ressources."""
+
+    def __init__(self, resources, k1: float = 1.2, b: float = 0.75):
+        self.resources = list(resources)
+        frequencies = []
+        for resource in self.resources:
+            tf: dict[str, float] = {}
+            for field, text in _fields(resource).items():
+                weight = FIELD_WEIGHTS[field]
+                for word in tokenize(text):
+                    tf[word] = tf.get(word, 0.0) + weight
+            frequencies.append(tf)
+        n = len(self.resources)
+        lengths = [sum(tf.values()) for tf in frequencies]
+        average = (sum(lengths) / n) if n else 1.0
+        documents: dict[str, list[int]] = {}
+        for doc, tf in enumerate(frequencies):
+            for word in tf:
+                documents.setdefault(word, []).append(doc)
+        # postings[mot] = {ressource: poids BM25}
+        self.postings: dict[str, dict[int, float]] = {}
+        for word, docs in documents.items():
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[word] = {
+                doc: idf * frequencies[doc][word] * (k1 + 1)
+                / (frequencies[doc][word] + k1 * (1 - b + b * lengths[doc] / average))
+                for doc in docs
+            }
+        # ranked[mot] = [(-poids, ressource), ...] par pertinence décroissante
+        self.ranked = {
+            word: sorted((-weight, doc) for doc, weight in weights.items())
+            for word, weights in self.postings.items()
+        }
+        self.vocabulary = sorted(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def _expansions(self, term: str) -> list[str]:
+        """Mots indexés plus longs commençant par ``term``."""
+        start = bisect.bisect_right(self.vocabulary, term)
+        words = []
+        for word in self.vocabulary[start:start + MAX_PREFIX_TERMS]:
+            if not word.startswith(term):
+                break
+            words.append(word)
+        return words
+
+    def _term_weights(self, term: str) -> dict[int, float]:
+        """Poids des ressources pour un mot de la requête (exact ou préfixe)."""
+        expansions = self._expansions(term)
+        if not expansions:
+            return self.postings.get(term, {})  # lecture seule
+        weights = dict(self.postings.get(term, ()))
+        for word in expansions:
+            for doc, weight in self.postings[word].items():
+                weight *= PREFIX_FACTOR
+                if weight > weights.get(doc, 0.0):
+                    weights[doc] = weight
+        return weights
+
+    def _search_one(self, term: str, k: int) -> list[int]:
+        """Requête d'un seul mot : fusion des listes prétriées, arrêt après ``k`` ressources."""
+        lists = [self.ranked.get(term, [])]
+        lists += [[(weight * PREFIX_FACTOR, doc) for weight, doc in self.ranked[word][:k]]
+                  for word in self._expansions(term)]
+        seen: dict[int, None] = {}
+        for _, doc in heapq.merge(*lists):
+            if doc not in seen:
+                seen[doc] = None
+                if len(seen) == k:
+                    break
+        return list(seen)
+
+    def score_any(self, weighted_terms: dict) -> dict[int, float]:
+        """Scores en OU : chaque mot trouvé (exact ou préfixe) ajoute son poids, multiplié par celui du mot."""
+        scores: dict[int, float] = {}
+        for term, factor in weighted_terms.items():
+            for doc, weight in self._term_weights(term).items():
+                scores[doc] = scores.get(doc, 0.0) + weight * factor
+        return scores
+
+    def search(self, query: str, k: int = 20) -> list[dict]:
+        """Les ``k`` ressources les plus pertinentes ; les ``k`` premières si la requête est vide."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return self.resources[:k] if not query.strip() else []
+        if len(terms) == 1:
+            return [self.resources[doc] for doc in self._search_one(terms[0], k)]
+        # Le mot le plus rare d'abord : il fixe les candidats
+        per_term = sorted((self._term_weights(term) for term in terms), key=len)
+        scores = per_term[0]
+        for weights in per_term[1:]:
+            scores = {doc: score + weights[doc] for doc, score in scores.items() if doc in weights}
+            if not scores:
+                return []
+        return [self.resources[doc] for doc in heapq.nlargest(k, scores, key=scores.__getitem__)]
@@ -0,0 +1,101 @@
+"""Sélection des ressources du catalogue à citer dans les prompts.
+
+Au lieu de paragraphes fixes sur quelques organismes, chaque prompt reçoit
+les ``k`` ressources du catalogue les plus proches de l'entrepreneur :
+secteur, compétences les plus faibles, niveau du profil et thème de la
+section (ou question posée au coach). Elles sont présentées en une ligne
+chacune, description raccourcie ; le modèle cite ces ressources plutôt que
+ses souvenirs. Une ressource n'est jamais proposée dans les sections listées
+dans son ``exclude_sections``.
+"""
+import heapq
+
+from resource_index import tokenize
+
+# Mots-clés du catalogue associés à chaque compétence à renforcer
+COMPETENCE_TERMS = {
+    "Leadership": "mentorat coaching accompagnement",
+    "Gestion & Délégation": "gestion formation accompagnement",
+    "Créativité & Innovation": "innovation incubation",
+    "Réseautage & Relations": "réseau mentorat",
+    "Résilience & Persévérance": "coaching mentorat accompagnement",
+    "Gestion Financière": "financement crédit éducation financière",
+}
+
+# Besoins typiques selon le niveau du profil
+TIER_TERMS = {
+    "Profil Débutant": "initiation formation accompagnement jeunes",
+    "Profil Émergent": "formation accompagnement incubation",
+    "Profil Intermédiaire": "accompagnement PME formalisation",
+    "Profil Avancé": "investissement PME réseau",
+    "Profil Excellence": "investissement réseau",
+}
+
+# Thème de chaque section de recommandations
+SECTION_TERMS = {
+    "formation": "formation certification apprentissage",
+    "strategie": "accompagnement diagnostics",
+    "mentorat": "mentorat coaching réseau",
+    "financement": "financement crédit investissement",
+    "plan_90": "accompagnement formalisation",
+}
+
+# Poids de chaque source de la requête
+WEIGHTS = {"section": 2.0, "question": 2.0, "competences": 1.0, "secteur": 1.0, "profil": 0.5}
+# Score minimal d'une ressource retenue : au moins un mot d'une compétence,
+# du secteur ou du thème en commun (le niveau du profil seul ne suffit pas)
+MIN_SCORE = 1.0
+# Longueur maximale d'une description dans un prompt
+MAX_DESCRIPTION_CHARS = 100
+
+
+def weakest_competences(scores: dict, n: int = 2) -> list[str]:
+    return [comp for comp, _ in sorted(scores.items(), key=lambda item: item[1])[:n]]
+
+
+def build_query(secteur: str = "", scores: dict | None = None, profil: str = "",
+                section: str | None = None, question: str = "") -> dict[str, float]:
+    """Mots de la requête de recherche avec leur poids."""
+    sources = {
+        "section": SECTION_TERMS.get(section, ""),
+        "question": question,
+        "competences": " ".join(COMPETENCE_TERMS.get(comp, "") for comp in weakest_competences(scores or {})),
+        "secteur": secteur,
+        "profil": TIER_TERMS.get(profil, ""),
+    }
+    terms: dict[str, float] = {}
+    for source, text in sources.items():
+        for word in tokenize(text):
+            terms[word] = max(terms.get(word, 0.0), WEIGHTS[source])
+    return terms
+
+
+def retrieve_resources(index, k: int = 3, **profile) -> list[dict]:
+    """Les ``k`` ressources les plus pertinentes pour le profil (voir ``build_query``),
+    parmi celles qui atteignent ``MIN_SCORE`` et ne sont pas exclues de la section."""
+    resources = index.resources
+    section = profile.get("section")
+    scores = {}
+    for doc, score in index.score_any(build_query(**profile)).items():
+        resource = resources[doc]
+        if section in resource.get("exclude_sections", ()):
+            continue
+        score *= resource.get("boost", 1.0)
+        if score >= MIN_SCORE:
+            scores[doc] = score
+    return [resources[doc] for doc in heapq.nlargest(k, scores, key=scores.__getitem__)]
+
+
+def shorten(text: str, limit: int = MAX_DESCRIPTION_CHARS) -> str:
+    """Texte coupé à la fin d'un mot s'il dépasse ``limit`` caractères."""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1].rsplit(" ", 1)[0].rstrip(" ,;:—-") + "…"
+
+
+def format_resources(resources) -> str:
+    """Bloc compact à insérer dans un prompt (vide s'il n'y a aucune ressource)."""
+    if not resources:
+        return ""
+    lines = "\n".join(f"- {r['name']} : {shorten(r['description'])}" for r in resources)
+    return f"Ressources locales du catalogue (privilégie celles-ci) :\n{lines}"
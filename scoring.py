@@ -0,0 +1,223 @@
+"""Cœur du calcul des scores, sans dépendance à Streamlit.
+
+Ce module ne dépend que de la bibliothèque standard : il est importé par
+l'application et peut l'être par les traitements par lots.
+
+Les réponses peuvent être fournies sous trois formes :
+
+- un dictionnaire ``{"Leadership_0": 4, ...}`` (clés ``f"{rubrique}_{i}"``,
+  comme dans ``st.session_state``) ;
+- un dictionnaire ``{"Leadership": [4, 5, ...], ...}`` ;
+- une séquence de 36 valeurs dans l'ordre de ``QUESTION_KEYS``.
+
+Les réponses absentes valent ``None`` ; la moyenne d'une rubrique sans
+réponse vaut 0.0.
+
+``ScoreAggregate`` conserve les réponses d'une session dans un ``bytearray``
+de 36 octets (0 = sans réponse, indexé par ``QUESTION_INDEX``) et tient à
+jour les sommes et nombres de réponses par rubrique : chaque réponse le met à
+jour en O(1), sans relire le questionnaire.
+"""
+from collections import namedtuple
+
+# Définition des compétences
+COMPETENCES = {
+    "Leadership": {
+        "questions": [
+            "Je prends facilement l'initiative dans un groupe",
+            "Je sais motiver et inspirer les autres",
+            "Je communique ma vision de façon claire et convaincante",
+            "Je sais prendre des décisions difficiles",
+            "Je responsabilise mon équipe et favorise l'autonomie",
+            "Je favorise la collaboration et résous les conflits efficacement"
+        ]
+    },
+    "Gestion & Délégation": {
+        "questions": [
+            "Je délègue facilement les tâches à mon équipe",
+            "Je fais confiance aux autres pour accomplir des tâches importantes",
+            "Je sais organiser et planifier efficacement",
+            "Je suis capable de suivre plusieurs projets simultanément",
+            "Je définis clairement les priorités et les échéances",
+            "Je mets en place des processus pour suivre l’avancement et la qualité"
+        ]
+    },
+    "Créativité & Innovation": {
+        "questions": [
+            "Je génère facilement des idées nouvelles",
+            "J'aime expérimenter de nouvelles approches",
+            "Je remets en question le statu quo",
+            "Je suis capable d'identifier des opportunités uniques",
+            "Je transforme des idées en solutions concrètes",
+            "J’observe le marché et j’adapte rapidement mes idées"
+        ]
+    },
+    "Réseautage & Relations": {
+        "questions": [
+            "Je construis facilement des relations professionnelles",
+            "Je maintiens un réseau actif de contacts",
+            "Je sais utiliser mon réseau pour atteindre mes objectifs",
+            "Je participe activement dans diverses communautés",
+            "Je sais entretenir des relations dans la durée",
+            "Je crée des partenariats stratégiques bénéfiques aux deux parties"
+        ]
+    },
+    "Résilience & Persévérance": {
+        "questions": [
+            "Je persiste face aux difficultés",
+            "Je maintiens mon focus sur mes objectifs à long terme",
+            "Je me relève rapidement après un échec",
+            "Je reste positif dans l'adversité",
+            "Je garde mon sang-froid sous pression",
+            "J’adapte mon plan d’action face aux imprévus sans perdre de vue mes objectifs"
+        ]
+    },
+    "Gestion Financière": {
+        "questions": [
+            "Je comprends les états financiers de base",
+            "Je sais gérer un budget efficacement",
+            "Je suis capable d'identifier des sources de financement",
+            "Je prends des décisions financières éclairées",
+            "Je planifie les flux de trésorerie à moyen terme",
+            "Je suis capable de fixer des prix rentables et compétitifs"
+        ]
+    }
+}
+
+# Niveaux de profil : (seuil de moyenne, libellé, description, couleur)
+PROFILS = [
+    (4.0, "Profil Excellence", "Entrepreneur avec des compétences très développées", "#2E7D32"),
+    (3.5, "Profil Avancé", "Entrepreneur expérimenté avec quelques axes d'amélioration", "#558B2F"),
+    (3.0, "Profil Intermédiaire", "Entrepreneur en développement avec un potentiel significatif", "#F9A825"),
+    (2.5, "Profil Émergent", "Entrepreneur débutant nécessitant un accompagnement ciblé", "#EF6C00"),
+    (0, "Profil Débutant", "Entrepreneur ayant besoin d'un accompagnement complet", "#C62828")
+]
+
+# Table des questions dans l'ordre : (rubrique, indice dans la rubrique)
+QUESTION_KEYS = [
+    (competence, i)
+    for competence, data in COMPETENCES.items()
+    for i in range(len(data["questions"]))
+]
+
+TOTAL_QUESTIONS = len(QUESTION_KEYS)
+
+# Position de chaque question dans QUESTION_KEYS (et dans ScoreAggregate.answers)
+QUESTION_INDEX = {key: n for n, key in enumerate(QUESTION_KEYS)}
+
+Evaluation = namedtuple("Evaluation", ["scores", "profil", "description", "couleur", "moyenne"])
+
+
+def question_key(competence: str, index: int) -> str:
+    """Clé d'une réponse, identique à celle utilisée dans st.session_state."""
+    return f"{competence}_{index}"
+
+
+def answers_by_competence(answers) -> dict:
+    """Normalise les réponses en ``{rubrique: [valeur ou None, ...]}``."""
+    if hasattr(answers, "get"):
+        result = {}
+        for competence, data in COMPETENCES.items():
+            listed = answers.get(competence)
+            if isinstance(listed, (list, tuple)):
+                result[competence] = list(listed)
+            else:
+                result[competence] = [
+                    answers.get(question_key(competence, i))
+                    for i in range(len(data["questions"]))
+                ]
+        return result
+    values = list(answers)
+    if len(values) != len(QUESTION_KEYS):
+        raise ValueError(f"{len(QUESTION_KEYS)} réponses attendues, {len(values)} reçues")
+    result = {competence: [] for competence in COMPETENCES}
+    for (competence, _), value in zip(QUESTION_KEYS, values):
+        result[competence].append(value)
+    return result
+
+
+def compute_scores(answers) -> dict:
+    """Moyenne des réponses par rubrique (0.0 si aucune réponse)."""
+    scores = {}
+    for competence, values in answers_by_competence(answers).items():
+        questions_scores = [v for v in values if v is not None]
+        scores[competence] = (sum(questions_scores) / len(questions_scores)) if questions_scores else 0.0
+    return scores
+
+
+class ScoreAggregate:
+    """Réponses d'une session et agrégats par rubrique, mis à jour à chaque réponse."""
+
+    __slots__ = ("answers", "sums", "counts")
+
+    def __init__(self, answers=None):
+        self.answers = bytearray(TOTAL_QUESTIONS)
+        self.sums = dict.fromkeys(COMPETENCES, 0)
+        self.counts = dict.fromkeys(COMPETENCES, 0)
+        if answers is not None:
+            for competence, values in answers_by_competence(answers).items():
+                for index, value in enumerate(values):
+                    self.set(competence, index, value)
+
+    def get(self, competence: str, index: int) -> int | None:
+        return self.answers[QUESTION_INDEX[competence, index]] or None
+
+    def set(self, competence: str, index: int, value: int | None) -> None:
+        """Enregistre la réponse (1 à 5, ou ``None`` pour l'effacer)."""
+        # Vérifiée avant toute modification : sommes et compteurs restent cohérents
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 5):
+            raise ValueError(f"Réponse invalide pour {competence} n°{index + 1} : {value!r} (1 à 5 ou None)")
+        position = QUESTION_INDEX[competence, index]
+        old = self.answers[position]
+        if old:
+            self.sums[competence] -= old
+            self.counts[competence] -= 1
+        if value is not None:
+            self.sums[competence] += value
+            self.counts[competence] += 1
+        self.answers[position] = value or 0
+
+    def values(self) -> list:
+        """Les 36 réponses dans l'ordre de ``QUESTION_KEYS`` (``None`` si absente)."""
+        return [value or None for value in self.answers]
+
+    def answered(self) -> int:
+        return sum(self.counts.values())
+
+    def is_completed(self, competence: str) -> bool:
+        return self.counts[competence] == len(COMPETENCES[competence]["questions"])
+
+    def all_completed(self) -> bool:
+        return self.answered() == TOTAL_QUESTIONS
+
+    def scores(self) -> dict:
+        """Mêmes valeurs que ``compute_scores`` sur les réponses enregistrées."""
+        return {
+            competence: (self.sums[competence] / count) if count else 0.0
+            for competence, count in self.counts.items()
+        }
+
+
+def calculer_profil(scores):
+    moyenne = sum(scores.values()) / len(scores)
+
+    for seuil, profil, desc, couleur in PROFILS:
+        if moyenne >= seuil:
+            return profil, desc, couleur, moyenne
+
+    return PROFILS[-1][1], PROFILS[-1][2], PROFILS[-1][3], moyenne
+
+
+def evaluer(answers) -> Evaluation:
+    """Calcule scores, profil, description, couleur et moyenne d'un répondant."""
+    scores = compute_scores(answers)
+    profil, description, couleur, moyenne = calculer_profil(scores)
+    return Evaluation(scores, profil, description, couleur, moyenne)
+
+
+# Fonction pour exporter les scores en CSV
+def make_scores_csv(scores: dict) -> str:
+    lines = ["competence,score"]
+    for comp, score in scores.items():
+        lines.append(f"{comp},{score:.2f}")
+    return "\n".join(lines)
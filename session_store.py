@@ -0,0 +1,245 @@
+"""Sauvegarde des sessions pour reprendre une évaluation interrompue.
+
+Chaque session est enregistrée sous un code de reprise : réponses, profil,
+textes générés et conversation avec le coach, sérialisés en JSON. Les
+écritures sont différées (write-behind) : ``save`` ne fait que remplacer la
+dernière version en attente, et un thread d'écriture enregistre toutes les
+sessions modifiées en un seul lot à intervalle régulier. Un clic n'attend
+donc jamais le stockage.
+
+Le stockage est interchangeable :
+
+- ``SQLiteBackend`` : base SQLite locale (par défaut) ;
+- ``FileBackend`` : un fichier JSON par session dans un répertoire, qui peut
+  être un volume partagé entre plusieurs réplicas ;
+- ``RedisBackend`` : tout serveur compatible Redis (Redis, Valkey, KeyDB...),
+  pour que n'importe quel réplica reprenne une session.
+
+Un backend fournit ``get(token)``, ``set_many({token: data})`` et ``count()``.
+"""
+import atexit
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import metrics
+
+
+class SQLiteBackend:
+    """Sessions dans une base SQLite locale (WAL)."""
+
+    def __init__(self, directory: str, ttl_seconds: int):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "sessions.sqlite3")
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " token TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at)")
+
+    def get(self, token: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, updated_at FROM sessions WHERE token = ?", (token,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return row[0]
+
+    def set_many(self, items: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sessions (token, data, updated_at) VALUES (?, ?, ?)",
+                    [(token, data, now) for token, data in items.items()],
+                )
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl_seconds,))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class FileBackend:
+    """Un fichier JSON par session ; l'expiration suit la date de modification."""
+
+    def __init__(self, directory: str, ttl_seconds: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self._last_purge = 0.0
+
+    def _path(self, token: str) -> str:
+        # Le code de reprise vient de l'URL : il n'est jamais utilisé tel quel comme nom de fichier
+        name = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, token: str) -> str | None:
+        path = self._path(token)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set_many(self, items: dict) -> None:
+        for token, data in items.items():
+            # Écriture atomique : un autre réplica ne lit jamais un fichier partiel
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, self._path(token))
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+        self._purge()
+
+    def _purge(self) -> None:
+        """Supprime les sessions expirées (au plus une fois par heure)."""
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.endswith(".json") and now - entry.stat().st_mtime > self.ttl_seconds:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass  # déjà supprimée par un autre réplica
+
+    def count(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+class RedisBackend:
+    """Sessions dans un serveur compatible Redis (clés ``{prefix}{token}`` avec TTL)."""
+
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "djambar:session:", client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("Le stockage Redis nécessite le paquet redis (pip install redis).")
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, token: str) -> str | None:
+        data = self.client.get(self.prefix + token)
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return data
+
+    def set_many(self, items: dict) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for token, data in items.items():
+            pipe.set(self.prefix + token, data, ex=self.ttl_seconds)
+        pipe.execute()
+
+    def count(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*", count=500))
+
+
+def make_backend(kind: str, ttl_seconds: int, directory: str = "", url: str = ""):
+    """Crée le backend ``sqlite``, ``file`` ou ``redis``."""
+    if kind == "sqlite":
+        return SQLiteBackend(directory, ttl_seconds)
+    if kind == "file":
+        return FileBackend(directory, ttl_seconds)
+    if kind == "redis":
+        return RedisBackend(url, ttl_seconds)
+    raise ValueError(f"Backend de sessions inconnu : {kind}")
+
+
+class SessionStore:
+    """Écritures différées vers un backend, partagé par toutes les sessions du processus."""
+
+    def __init__(self, backend, flush_interval: float = 0.5):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: dict[str, str] = {}
+        self._inflight: dict[str, str] = {}
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def save(self, token: str, data: str) -> None:
+        """Planifie l'enregistrement de la session (la dernière version l'emporte)."""
+        with self._lock:
+            self._pending[token] = data
+        metrics.incr("session_store.saves")
+        self._wakeup.set()
+
+    def load(self, token: str) -> str | None:
+        """Retourne la session enregistrée (y compris une écriture en attente), ou None."""
+        with self._lock:
+            data = self._pending.get(token) or self._inflight.get(token)
+        if data is not None:
+            return data
+        return self.backend.get(token)
+
+    def flush(self) -> int:
+        """Écrit toutes les sessions en attente en un lot ; retourne leur nombre."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+        if not batch:
+            return 0
+        try:
+            self.backend.set_many(batch)
+        except BaseException:
+            with self._lock:
+                # Les versions plus récentes déjà planifiées restent prioritaires
+                for token, data in batch.items():
+                    self._pending.setdefault(token, data)
+            raise
+        finally:
+            with self._lock:
+                self._inflight = {}
+        metrics.observe("session_store.batch_size", len(batch))
+        return len(batch)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait()
+            # Laisse les clics suivants rejoindre le même lot
+            time.sleep(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                metrics.incr("session_store.errors")
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._wakeup.set()
+            self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {"backend": type(self.backend).__name__, "sessions": self.backend.count(), "pending_writes": pending}
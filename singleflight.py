@@ -0,0 +1,219 @@
+"""Regroupement des requêtes de streaming identiques en cours (« singleflight »).
+
+Quand plusieurs sessions lancent la même requête au même moment (même
+empreinte de messages), un seul flux amont est ouvert. Il est lu par un
+thread qui publie les fragments ; chaque appelant s'abonne au même fil et
+l'affiche dans son propre placeholder. Un abonné arrivé en cours de route
+reçoit d'abord les fragments déjà publiés. Une erreur amont est transmise à
+tous les abonnés. Si le premier appelant abandonne avant l'ouverture du flux
+(attente dans la file interrompue), son exception ne concerne que lui : les
+autres abonnés relancent la requête, l'un d'eux devenant le nouveau premier.
+
+Quand le dernier abonné abandonne (script interrompu ou remplacé), le flux
+amont est fermé au fragment suivant au lieu d'être lu jusqu'au bout.
+"""
+import threading
+
+import metrics
+from stream_cancel import close_upstream, record_cancelled, record_completed
+
+
+class _Flight:
+    """Fragments publiés d'un flux amont, lisibles par plusieurs abonnés."""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 1
+        # Abonnés encore à l'écoute ; le flux est annulé quand il n'en reste aucun
+        self.listening = 1
+        self.cancelled = False
+        # Premier appelant parti avant l'ouverture du flux : les abonnés relancent la requête
+        self.abandoned = False
+        self._cond = threading.Condition()
+
+    def publish(self, chunk: str) -> None:
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error: BaseException | None = None, exhausted: bool = False, abandoned: bool = False) -> str:
+        """Termine le flux et retourne son issue : ``completed``, ``cancelled``, ``error`` ou ``abandoned``.
+
+        L'issue est décidée ici, sous le verrou : un flux lu jusqu'au bout
+        (``exhausted``) est terminé même si son dernier abonné vient de partir.
+        """
+        with self._cond:
+            self.done = True
+            self.error = error
+            self.abandoned = abandoned
+            if exhausted and error is None:
+                self.cancelled = False
+            self._cond.notify_all()
+            if abandoned:
+                return "abandoned"
+            if self.cancelled:
+                return "cancelled"
+            return "completed" if error is None else "error"
+
+    def join(self) -> bool:
+        """Ajoute un abonné ; False si le flux est déjà annulé."""
+        with self._cond:
+            if self.cancelled:
+                return False
+            self.subscribers += 1
+            self.listening += 1
+            return True
+
+    def leave(self) -> None:
+        with self._cond:
+            self.listening -= 1
+            if self.listening == 0 and not self.done:
+                self.cancelled = True
+
+
+class Subscription:
+    """Abonnement à un flux : itérable, à fermer (``close``) une fois lu ou abandonné.
+
+    L'abonné est retiré à la fin de l'itération ou à la fermeture, même si
+    l'abonnement est fermé avant d'avoir été itéré. Un flux abandonné par son
+    premier appelant est relancé par ``rejoin()``, dans le thread de l'abonné.
+    """
+
+    def __init__(self, flight: _Flight, rejoin=None):
+        self._flight = flight
+        self._rejoin = rejoin
+        self._position = 0
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        while True:
+            flight = self._flight
+            with flight._cond:
+                while self._position >= len(flight.chunks) and not flight.done:
+                    flight._cond.wait()
+                if self._position < len(flight.chunks):
+                    chunk = flight.chunks[self._position]
+                    self._position += 1
+                    return chunk
+                error = flight.error
+                abandoned = flight.abandoned
+            if not abandoned or self._rejoin is None:
+                break
+            self.close()
+            self._flight = self._rejoin()
+            self._position = 0
+            self._closed = False
+        self.close()
+        if error is not None:
+            raise error
+        raise StopIteration
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._flight.leave()
+
+    def __del__(self):
+        self.close()
+
+
+class SingleFlight:
+    """Flux amont partagés, indexés par l'empreinte de la requête."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    def stream(self, key: str, open_stream, acquire=None):
+        """Abonnement (``Subscription``) aux fragments de la requête ``key``.
+
+        ``open_stream()`` retourne un itérateur de fragments de texte ; il n'est
+        appelé que si aucune requête identique n'est déjà en cours. ``acquire()``
+        (optionnel) est appelé par le premier appelant avant l'ouverture du flux
+        et retourne une place libérée en fin de flux (voir ``llm_scheduler``).
+        """
+        flight = self._join(key, open_stream, acquire)
+        return Subscription(flight, rejoin=lambda: self._join(key, open_stream, acquire))
+
+    def _join(self, key: str, open_stream, acquire) -> _Flight:
+        """Rejoint le flux en cours de ``key`` ou en devient le premier appelant."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None or not flight.join():
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if leader:
+            metrics.incr("llm.singleflight.leaders")
+            try:
+                slot = acquire() if acquire is not None else None
+            except BaseException:
+                # Abandon pendant l'attente. L'exception peut être un contrôle propre à la
+                # session (arrêt, réexécution de Streamlit) : elle n'est levée que chez
+                # l'appelant, les autres abonnés relancent la requête.
+                self._finish(key, flight, None, abandoned=True)
+                raise
+            threading.Thread(
+                target=self._drive, args=(key, flight, open_stream, slot), name="singleflight", daemon=True
+            ).start()
+        else:
+            metrics.incr("llm.singleflight.coalesced")
+        return flight
+
+    def _drive(self, key: str, flight: _Flight, open_stream, slot) -> None:
+        # Le flux est lu tant qu'au moins un abonné, pas seulement le premier, l'écoute
+        error = None
+        upstream = None
+        exhausted = False
+        try:
+            upstream = open_stream()
+            for chunk in upstream:
+                if flight.cancelled:
+                    break
+                flight.publish(chunk)
+            else:
+                exhausted = True
+        except BaseException as e:
+            error = e
+        finally:
+            if upstream is not None:
+                close_upstream(upstream)
+            if slot is not None:
+                slot.release()
+            outcome = self._finish(key, flight, error, exhausted)
+        received = "".join(flight.chunks)
+        if outcome == "cancelled":
+            with self._lock:
+                self.cancelled += 1
+            record_cancelled("reco", received)
+        elif outcome == "completed":
+            record_completed("reco", received)
+
+    def _finish(self, key: str, flight: _Flight, error: BaseException | None,
+                exhausted: bool = False, abandoned: bool = False) -> str:
+        outcome = flight.finish(error, exhausted, abandoned)
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        metrics.observe("llm.singleflight.subscribers", flight.subscribers)
+        return outcome
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "cancelled": self.cancelled,
+            }
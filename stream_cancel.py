@@ -0,0 +1,36 @@
+"""Fermeture des flux amont abandonnés et mesure des tokens économisés.
+
+Quand Streamlit interrompt le script (clic, navigation, nouvelle exécution),
+la lecture d'un flux de réponse s'arrête mais la réponse HTTP peut rester
+ouverte : le fournisseur continue alors de générer, et de facturer, des
+tokens que personne n'affichera. Les flux abandonnés sont donc fermés
+explicitement.
+
+Le nombre de tokens économisés est une estimation : longueur moyenne des
+réponses complètes du même type, moins ce qui a déjà été reçu.
+"""
+import metrics
+from chat_history import estimate_tokens
+
+# Longueur supposée d'une réponse tant qu'aucune réponse complète n'a été mesurée
+DEFAULT_COMPLETION_TOKENS = {"reco": 700, "chat": 250}
+
+
+def close_upstream(stream) -> None:
+    """Ferme la réponse HTTP d'un flux (objet ``Stream`` du client ou générateur)."""
+    close = getattr(stream, "close", None)
+    if close is not None:
+        close()
+
+
+def record_completed(kind: str, text: str) -> None:
+    metrics.observe(f"llm.completion_tokens.{kind}", estimate_tokens(text))
+
+
+def record_cancelled(kind: str, received_text: str) -> int:
+    """Compte un flux abandonné et retourne l'estimation des tokens économisés."""
+    expected = metrics.mean(f"llm.completion_tokens.{kind}", DEFAULT_COMPLETION_TOKENS.get(kind, 500))
+    saved = max(0, round(expected) - estimate_tokens(received_text))
+    metrics.incr("llm.cancelled_streams")
+    metrics.incr("llm.tokens_saved", saved)
+    return saved
@@ -0,0 +1,53 @@
+"""Affichage limité en débit des réponses reçues en streaming.
+
+Chaque appel à ``placeholder.markdown`` renvoie tout le texte au navigateur.
+Le rendu est donc regroupé : les fragments sont accumulés dans une liste et le
+texte n'est envoyé qu'après un délai ou un volume minimal, puis une dernière
+fois, exactement, en fin de réponse.
+"""
+import time
+
+import metrics
+
+
+class StreamRenderer:
+    """Accumule les fragments d'une réponse et met à jour le placeholder par lots."""
+
+    def __init__(self, placeholder, interval: float = 0.08, max_pending_bytes: int = 2048,
+                 clock=time.monotonic):
+        self.placeholder = placeholder
+        self.interval = interval
+        self.max_pending_bytes = max_pending_bytes
+        self.clock = clock
+        self.parts: list[str] = []
+        self.deltas = 0
+        self.total_bytes = 0
+        self._pending_bytes = 0
+        self._last_flush = clock()
+
+    def feed(self, chunk: str) -> None:
+        """Ajoute un fragment ; n'envoie le texte que si le budget est atteint."""
+        self.parts.append(chunk)
+        size = len(chunk.encode("utf-8"))
+        self._pending_bytes += size
+        self.total_bytes += size
+        now = self.clock()
+        if now - self._last_flush >= self.interval or self._pending_bytes >= self.max_pending_bytes:
+            self.flush(now)
+
+    def flush(self, now: float | None = None) -> None:
+        self.placeholder.markdown("".join(self.parts))
+        self.deltas += 1
+        self._pending_bytes = 0
+        self._last_flush = self.clock() if now is None else now
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def close(self) -> str:
+        """Envoie le texte complet s'il reste des fragments non affichés et le retourne."""
+        if self._pending_bytes:
+            self.flush()
+        metrics.observe("stream.deltas_per_response", self.deltas)
+        metrics.observe("stream.bytes_per_response", self.total_bytes)
+        return self.text()